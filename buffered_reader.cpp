@@ -0,0 +1,86 @@
+#include "buffered_reader.h"
+#include <algorithm>
+#include <cstring>
+
+BufferedSocketReader::BufferedSocketReader(socket_t sock, size_t buffer_size)
+    : sock_(sock)
+    , buffer_(buffer_size)
+    , pos_(0)
+    , end_(0) {
+}
+
+bool BufferedSocketReader::fill() {
+    pos_ = 0;
+    end_ = 0;
+
+    ssize_t received = network::recv_data(sock_, buffer_.data(), buffer_.size());
+    if (received <= 0) {
+        // 0 covers both peer close and a receive timeout on these
+        // blocking sockets - either way there is nothing more to parse
+        return false;
+    }
+
+    end_ = static_cast<size_t>(received);
+    return true;
+}
+
+bool BufferedSocketReader::read_line(std::string& line, size_t max_length) {
+    line.clear();
+
+    while (line.size() <= max_length) {
+        if (pos_ >= end_) {
+            if (!fill()) {
+                return false;
+            }
+        }
+
+        // Scan buffered data for the line terminator
+        const char* start = buffer_.data() + pos_;
+        size_t available = end_ - pos_;
+        const char* newline = static_cast<const char*>(std::memchr(start, '\n', available));
+
+        if (newline != nullptr) {
+            size_t chunk_len = static_cast<size_t>(newline - start);
+            line.append(start, chunk_len);
+            pos_ += chunk_len + 1; // Consume the \n too
+
+            // Strip trailing \r (RFC 7230 lines end with \r\n)
+            if (!line.empty() && line.back() == '\r') {
+                line.pop_back();
+            }
+            return line.size() <= max_length;
+        }
+
+        // No terminator yet - take everything and refill on next pass
+        line.append(start, available);
+        pos_ = end_;
+    }
+
+    return false; // Max length exceeded
+}
+
+bool BufferedSocketReader::read_exact(uint8_t* dest, size_t len) {
+    size_t copied = 0;
+
+    // Drain whatever is already buffered first
+    if (pos_ < end_) {
+        size_t available = end_ - pos_;
+        size_t to_copy = std::min(available, len);
+        std::memcpy(dest, buffer_.data() + pos_, to_copy);
+        pos_ += to_copy;
+        copied = to_copy;
+    }
+
+    // The rest goes straight from the socket into the caller's buffer:
+    // bouncing a large body through the internal buffer would add a full
+    // extra copy of every remaining byte
+    while (copied < len) {
+        ssize_t received = network::recv_data(sock_, dest + copied, len - copied);
+        if (received <= 0) {
+            return false;
+        }
+        copied += static_cast<size_t>(received);
+    }
+
+    return true;
+}
@@ -0,0 +1,44 @@
+#ifndef BUFFERED_READER_H
+#define BUFFERED_READER_H
+
+#include <cstdint>
+#include <string>
+#include <vector>
+#include "network.h"
+
+// Buffered socket reader for protocol parsing
+// Reading HTTP request/response lines one byte per recv() costs a syscall
+// per character; this reader pulls data in large chunks and serves lines
+// and fixed-length reads out of the buffer.
+
+class BufferedSocketReader {
+public:
+    explicit BufferedSocketReader(socket_t sock, size_t buffer_size = 8192);
+
+    // Read a line terminated by \n (optional preceding \r is stripped).
+    // Returns false on EOF/error or if max_length is exceeded.
+    bool read_line(std::string& line, size_t max_length = 8192);
+
+    // Read exactly len bytes into dest. Returns false on EOF/error.
+    bool read_exact(uint8_t* dest, size_t len);
+
+    socket_t socket() const { return sock_; }
+
+    // Bytes already received but not yet consumed (e.g. data a client
+    // pipelined behind a CONNECT request). Must be drained before handing
+    // the raw socket to a relay loop.
+    size_t pending() const { return end_ - pos_; }
+    const char* pending_data() const { return buffer_.data() + pos_; }
+    void consume(size_t n) { pos_ += (n < end_ - pos_ ? n : end_ - pos_); }
+
+private:
+    // Refill the buffer from the socket. Returns false on EOF/error.
+    bool fill();
+
+    socket_t sock_;
+    std::vector<char> buffer_;
+    size_t pos_;  // Next unread byte
+    size_t end_;  // One past last valid byte
+};
+
+#endif // BUFFERED_READER_H
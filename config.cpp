@@ -3,6 +3,7 @@
 #include <fstream>
 #include <sstream>
 #include <iomanip>
+#include <cstdio>
 #include <cctype>
 #include <algorithm>
 #include <map>
@@ -39,6 +40,7 @@ static std::string config_to_json(const Config& config) {
     }
     oss << "],\n";
     oss << "  \"health_check_interval\": " << config.health_check_interval << ",\n";
+    oss << "  \"probe_concurrency\": " << config.probe_concurrency << ",\n";
     oss << "  \"accessibility_timeout\": " << config.accessibility_timeout << ",\n";
     oss << "  \"dns_timeout\": " << config.dns_timeout << ",\n";
     oss << "  \"network_timeout\": " << config.network_timeout << ",\n";
@@ -53,6 +55,15 @@ static std::string config_to_json(const Config& config) {
     oss << "  \"log_backup_count\": " << config.log_backup_count << ",\n";
     oss << "  \"proxy_listen_host\": \"" << config.proxy_listen_host << "\",\n";
     oss << "  \"proxy_listen_port\": " << config.proxy_listen_port << ",\n";
+    oss << "  \"proxy_auth_users\": {";
+    {
+        size_t i = 0;
+        for (const auto& pair : config.proxy_auth_users) {
+            oss << "\"" << pair.first << "\": \"" << pair.second << "\"";
+            if (++i < config.proxy_auth_users.size()) oss << ", ";
+        }
+    }
+    oss << "},\n";
     oss << "  \"mouse_enabled\": " << (config.mouse_enabled ? "true" : "false") << ",\n";
     oss << "  \"webui_enabled\": " << (config.webui_enabled ? "true" : "false") << ",\n";
     oss << "  \"webui_listen_host\": \"" << config.webui_listen_host << "\",\n";
@@ -62,9 +73,30 @@ static std::string config_to_json(const Config& config) {
 }
 
 bool Config::save(const std::string& path) const {
-    std::ofstream out(path);
-    if (!out.is_open()) return false;
-    out << config_to_json(*this) << std::endl;
+    // Write to a sibling temp file and rename it over the target: a crash
+    // mid-write leaves the previous config intact instead of a truncated
+    // file, and a concurrent load() never sees a half-written one (rename
+    // within a directory is atomic on POSIX)
+    std::string tmp_path = path + ".tmp";
+    {
+        std::ofstream out(tmp_path, std::ios::trunc);
+        if (!out.is_open()) return false;
+        out << config_to_json(*this) << std::endl;
+        if (!out.good()) {
+            out.close();
+            std::remove(tmp_path.c_str());
+            return false;
+        }
+    }
+
+#ifdef _WIN32
+    // rename() refuses to replace an existing file on Windows
+    std::remove(path.c_str());
+#endif
+    if (std::rename(tmp_path.c_str(), path.c_str()) != 0) {
+        std::remove(tmp_path.c_str());
+        return false;
+    }
     return true;
 }
 
@@ -74,6 +106,7 @@ bool Config::save(const std::string& path) const {
 Config::Config() 
     : routing_mode(RoutingMode::Latency)
     , health_check_interval(60)
+    , probe_concurrency(4)
     , accessibility_timeout(5)
     , dns_timeout(3.0)
     , network_timeout(10)
@@ -109,17 +142,16 @@ Config Config::load(const std::string& path) {
     if (!file.is_open()) {
         return Config(); // Return default config
     }
-    
+
     std::stringstream buffer;
     buffer << file.rdbuf();
     return parse_json(buffer.str());
 }
 
-std::string Config::skip_whitespace(const std::string& str, size_t& pos) {
+void Config::skip_whitespace(const std::string& str, size_t& pos) {
     while (pos < str.length() && std::isspace(static_cast<unsigned char>(str[pos]))) {
         pos++;
     }
-    return str.substr(pos);
 }
 
 bool Config::parse_string(const std::string& str, size_t& pos, std::string& result) {
@@ -190,12 +222,12 @@ bool Config::parse_number(const std::string& str, size_t& pos, double& result) {
 }
 
 bool Config::parse_boolean(const std::string& str, size_t& pos, bool& result) {
-    if (str.substr(pos, 4) == "true") {
+    if (str.compare(pos, 4, "true") == 0) {
         result = true;
         pos += 4;
         return true;
     }
-    if (str.substr(pos, 5) == "false") {
+    if (str.compare(pos, 5, "false") == 0) {
         result = false;
         pos += 5;
         return true;
@@ -204,7 +236,7 @@ bool Config::parse_boolean(const std::string& str, size_t& pos, bool& result) {
 }
 
 bool Config::parse_null(const std::string& str, size_t& pos) {
-    if (str.substr(pos, 4) == "null") {
+    if (str.compare(pos, 4, "null") == 0) {
         pos += 4;
         return true;
     }
@@ -382,6 +414,14 @@ Config Config::parse_json(const std::string& json_str) {
         std::string s = utils::trim(root["health_check_interval"]);
         if (utils::safe_str_to_uint64(s, val)) config.health_check_interval = val;
     }
+    if (root.find("probe_concurrency") != root.end()) {
+        uint64_t val;
+        std::string s = utils::trim(root["probe_concurrency"]);
+        // Zero would mean no probing at all; treat it as absent
+        if (utils::safe_str_to_uint64(s, val) && val > 0) {
+            config.probe_concurrency = static_cast<size_t>(val);
+        }
+    }
     if (root.find("accessibility_timeout") != root.end()) {
         uint64_t val;
         std::string s = utils::trim(root["accessibility_timeout"]);
@@ -397,6 +437,14 @@ Config Config::parse_json(const std::string& json_str) {
         std::string s = utils::trim(root["network_timeout"]);
         if (utils::safe_str_to_uint64(s, val)) config.network_timeout = val;
     }
+    if (root.find("max_concurrent_connections") != root.end()) {
+        uint64_t val;
+        std::string s = utils::trim(root["max_concurrent_connections"]);
+        // Zero disables the admission gate entirely
+        if (utils::safe_str_to_uint64(s, val)) {
+            config.max_concurrent_connections = static_cast<size_t>(val);
+        }
+    }
     if (root.find("proxy_listen_port") != root.end()) {
         uint16_t val;
         std::string s = utils::trim(root["proxy_listen_port"]);
@@ -408,6 +456,14 @@ Config Config::parse_json(const std::string& json_str) {
             config.proxy_listen_host = host.substr(1, host.length() - 2);
         }
     }
+
+    // Parse log_level
+    if (root.find("log_level") != root.end()) {
+        std::string level = utils::trim(root["log_level"]);
+        if (level.length() >= 2 && level[0] == '"' && level[level.length()-1] == '"') {
+            config.log_level = level.substr(1, level.length() - 2);
+        }
+    }
     
     // Parse mouse_enabled boolean
     if (root.find("mouse_enabled") != root.end()) {
@@ -542,6 +598,29 @@ Config Config::parse_json(const std::string& json_str) {
         }
     }
     
+    // Parse proxy_auth_users object: {"username": "password", ...}
+    size_t auth_start = json_str.find("\"proxy_auth_users\"");
+    if (auth_start != std::string::npos) {
+        size_t obj_start = json_str.find('{', auth_start);
+        if (obj_start != std::string::npos) {
+            size_t obj_end = json_str.find('}', obj_start);
+            if (obj_end != std::string::npos) {
+                std::map<std::string, std::string> users;
+                std::string auth_obj = "{" + json_str.substr(obj_start + 1, obj_end - obj_start - 1) + "}";
+                size_t parse_pos = 0;
+                if (parse_object(auth_obj, parse_pos, users)) {
+                    for (const auto& pair : users) {
+                        std::string password = utils::trim(pair.second);
+                        if (password.length() >= 2 && password[0] == '"' && password[password.length()-1] == '"') {
+                            password = password.substr(1, password.length() - 2);
+                        }
+                        config.proxy_auth_users[pair.first] = password;
+                    }
+                }
+            }
+        }
+    }
+
     // Parse interfaces array
     size_t iface_start = json_str.find("\"interfaces\"");
     if (iface_start != std::string::npos) {
@@ -43,6 +43,7 @@ struct Config {
     std::vector<UpstreamProxyConfig> upstream_proxies;
     std::vector<std::string> interfaces;
     uint64_t health_check_interval;
+    size_t probe_concurrency; // Worker threads per health-check cycle
     uint64_t accessibility_timeout;
     double dns_timeout;
     uint64_t network_timeout;
@@ -57,6 +58,7 @@ struct Config {
     size_t log_backup_count;
     std::string proxy_listen_host;
     uint16_t proxy_listen_port;
+    std::map<std::string, std::string> proxy_auth_users; // username -> password; empty = no auth
     bool mouse_enabled; // Enable mouse support in TUI
     bool webui_enabled; // Enable web UI server
     std::string webui_listen_host; // Web UI listen host
@@ -68,7 +70,7 @@ struct Config {
     
 private:
     // Simple JSON parser helpers
-    static std::string skip_whitespace(const std::string& str, size_t& pos);
+    static void skip_whitespace(const std::string& str, size_t& pos);
     static bool parse_string(const std::string& str, size_t& pos, std::string& result);
     static bool parse_number(const std::string& str, size_t& pos, double& result);
     static bool parse_boolean(const std::string& str, size_t& pos, bool& result);
@@ -0,0 +1,179 @@
+#include "connection_pool.h"
+#include <ctime>
+#include <cerrno>
+
+#ifdef _WIN32
+#include <winsock2.h>
+#else
+#include <sys/socket.h>
+#include <netinet/tcp.h>
+#endif
+
+UpstreamConnectionPool::UpstreamConnectionPool(size_t max_idle_per_key, uint64_t idle_timeout_secs)
+    : max_idle_per_key_(max_idle_per_key)
+    , idle_timeout_secs_(idle_timeout_secs) {
+}
+
+UpstreamConnectionPool::~UpstreamConnectionPool() {
+    clear();
+}
+
+uint64_t UpstreamConnectionPool::get_current_time() const {
+    return static_cast<uint64_t>(std::time(nullptr));
+}
+
+bool UpstreamConnectionPool::is_alive(socket_t sock) const {
+    // A healthy idle connection has no readable data: MSG_PEEK returns
+    // "would block". 0 means the peer closed; unexpected buffered data means
+    // the connection is out of sync with the protocol, so drop it too.
+    char probe;
+#ifdef _WIN32
+    // Windows has no MSG_DONTWAIT; use a zero-timeout select for readability
+    fd_set readfds;
+    FD_ZERO(&readfds);
+    FD_SET(sock, &readfds);
+    struct timeval zero_timeout;
+    zero_timeout.tv_sec = 0;
+    zero_timeout.tv_usec = 0;
+    int ready = select(0, &readfds, nullptr, nullptr, &zero_timeout);
+    if (ready == 0) {
+        return true; // Nothing to read - still connected and idle
+    }
+    if (ready < 0) {
+        return false;
+    }
+    // Readable: either EOF or stray data - both mean we cannot reuse it
+    int received = recv(sock, &probe, 1, MSG_PEEK);
+    (void)received;
+    return false;
+#else
+    ssize_t received = recv(sock, &probe, 1, MSG_PEEK | MSG_DONTWAIT);
+    if (received < 0 && (errno == EAGAIN || errno == EWOULDBLOCK)) {
+        return true; // Nothing to read - still connected and idle
+    }
+    return false;
+#endif
+}
+
+void UpstreamConnectionPool::reap_expired_locked(uint64_t now) {
+    for (auto& pair : idle_) {
+        auto& queue = pair.second;
+        while (!queue.empty() &&
+               now - queue.front().idle_since > idle_timeout_secs_) {
+            network::close_socket(queue.front().sock);
+            queue.pop_front();
+        }
+    }
+}
+
+socket_t UpstreamConnectionPool::acquire(const std::string& host, uint16_t port,
+                                         const std::string& source_ip,
+                                         double timeout_secs, bool& reused) {
+    reused = false;
+    PoolKey key(host, port, source_ip);
+
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        reap_expired_locked(get_current_time());
+
+        auto it = idle_.find(key);
+        if (it != idle_.end()) {
+            auto& queue = it->second;
+            // Take the most recently released connection first - it is the
+            // most likely to still be alive
+            while (!queue.empty()) {
+                socket_t sock = queue.back().sock;
+                queue.pop_back();
+                if (is_alive(sock)) {
+                    reused = true;
+                    return sock;
+                }
+                // Already dead - skip the FIN handshake and its TIME_WAIT
+                network::abortive_close(sock);
+            }
+        }
+    }
+
+    // No reusable connection - dial a new one
+    socket_t sock = network::create_tcp_socket();
+    if (sock == network::INVALID_SOCKET_VALUE) {
+        return network::INVALID_SOCKET_VALUE;
+    }
+
+    // Set timeout
+    struct timeval timeout;
+    timeout.tv_sec = static_cast<long>(timeout_secs);
+    timeout.tv_usec = static_cast<long>((timeout_secs - timeout.tv_sec) * 1000000);
+
+#ifdef _WIN32
+    setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, reinterpret_cast<const char*>(&timeout), sizeof(timeout));
+    setsockopt(sock, SOL_SOCKET, SO_SNDTIMEO, reinterpret_cast<const char*>(&timeout), sizeof(timeout));
+#else
+    setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof(timeout));
+    setsockopt(sock, SOL_SOCKET, SO_SNDTIMEO, &timeout, sizeof(timeout));
+#endif
+
+    // Keep-alive so the kernel notices half-dead pooled connections;
+    // TCP_NODELAY so small proxied writes are not held back by Nagle
+    network::tune_relay_socket(sock);
+
+    // Bind to the runway's source address when one is given
+    if (!source_ip.empty() && source_ip != "0.0.0.0") {
+        if (!network::bind_socket(sock, source_ip, 0)) {
+            network::close_socket(sock);
+            return network::INVALID_SOCKET_VALUE;
+        }
+    }
+
+    if (!network::connect_with_timeout(sock, host, port, timeout_secs)) {
+        network::close_socket(sock);
+        return network::INVALID_SOCKET_VALUE;
+    }
+
+    return sock;
+}
+
+void UpstreamConnectionPool::release(const std::string& host, uint16_t port,
+                                     const std::string& source_ip, socket_t sock) {
+    if (sock == network::INVALID_SOCKET_VALUE) {
+        return;
+    }
+
+    if (!is_alive(sock)) {
+        network::abortive_close(sock);
+        return;
+    }
+
+    PoolKey key(host, port, source_ip);
+    std::lock_guard<std::mutex> lock(mutex_);
+
+    auto& queue = idle_[key];
+    if (queue.size() >= max_idle_per_key_) {
+        // Pool full for this upstream - drop the oldest idle connection
+        network::close_socket(queue.front().sock);
+        queue.pop_front();
+    }
+
+    IdleConnection conn;
+    conn.sock = sock;
+    conn.idle_since = get_current_time();
+    queue.push_back(conn);
+}
+
+void UpstreamConnectionPool::discard(socket_t sock) {
+    // Callers discard connections that failed an in-band check (e.g. a
+    // probe's HEAD round trip), so the peer state is unknown - RST it
+    if (sock != network::INVALID_SOCKET_VALUE) {
+        network::abortive_close(sock);
+    }
+}
+
+void UpstreamConnectionPool::clear() {
+    std::lock_guard<std::mutex> lock(mutex_);
+    for (auto& pair : idle_) {
+        for (auto& conn : pair.second) {
+            network::close_socket(conn.sock);
+        }
+    }
+    idle_.clear();
+}
@@ -0,0 +1,65 @@
+#ifndef CONNECTION_POOL_H
+#define CONNECTION_POOL_H
+
+#include <string>
+#include <map>
+#include <deque>
+#include <tuple>
+#include <mutex>
+#include <cstdint>
+#include "network.h"
+
+// Pooled keep-alive TCP connections to upstream proxies
+// Reusing an idle connection avoids the TCP 3-way handshake (1 RTT) that a
+// fresh dial pays on every probe and every client session.
+// Connections are keyed by (host, port, source_ip) so runways bound to
+// different interfaces never share sockets.
+
+class UpstreamConnectionPool {
+public:
+    UpstreamConnectionPool(size_t max_idle_per_key = 4, uint64_t idle_timeout_secs = 60);
+    ~UpstreamConnectionPool();
+
+    // Get a connected socket to host:port, optionally bound to source_ip.
+    // Reuses an idle pooled connection when one is still alive, otherwise
+    // dials a new one with the given timeout.
+    // Returns INVALID_SOCKET_VALUE on failure; sets reused when the socket
+    // came from the pool.
+    socket_t acquire(const std::string& host, uint16_t port,
+                     const std::string& source_ip, double timeout_secs, bool& reused);
+
+    // Return a healthy socket to the pool for later reuse.
+    // Closes the socket instead if the per-key idle limit is reached.
+    void release(const std::string& host, uint16_t port,
+                 const std::string& source_ip, socket_t sock);
+
+    // Close and drop a socket that is no longer usable.
+    void discard(socket_t sock);
+
+    // Close all pooled idle sockets.
+    void clear();
+
+private:
+    struct IdleConnection {
+        socket_t sock;
+        uint64_t idle_since; // Unix timestamp
+    };
+
+    // (host, port, source_ip)
+    using PoolKey = std::tuple<std::string, uint16_t, std::string>;
+
+    size_t max_idle_per_key_;
+    uint64_t idle_timeout_secs_;
+    std::map<PoolKey, std::deque<IdleConnection>> idle_;
+    std::mutex mutex_;
+
+    // Check whether an idle socket is still connected (peer has not closed)
+    bool is_alive(socket_t sock) const;
+
+    // Close idle sockets that exceeded the idle timeout (call with mutex held)
+    void reap_expired_locked(uint64_t now);
+
+    uint64_t get_current_time() const;
+};
+
+#endif // CONNECTION_POOL_H
@@ -2,7 +2,10 @@
 #include "utils.h"
 #include <cstring>
 #include <algorithm>
+#include <chrono>
+#include <thread>
 #include <ctime>
+#include <random>
 
 #ifdef _WIN32
 #include <winsock2.h>
@@ -13,10 +16,14 @@
 // RFC 1035 - Domain Names - Implementation and Specification
 
 DNSResolver::DNSResolver(const std::vector<DNSServerConfig>& servers, double timeout_secs)
-    : servers_(servers), timeout_secs_(timeout_secs) {
+    : servers_(servers), timeout_secs_(timeout_secs), active_refreshes_(0) {
 }
 
 DNSResolver::~DNSResolver() {
+    // Serve-stale refreshes run on detached threads that touch cache_ and
+    // mutex_; wait them out so none outlives this object
+    std::unique_lock<std::mutex> lock(mutex_);
+    refresh_done_cv_.wait(lock, [this]() { return active_refreshes_ == 0; });
 }
 
 uint64_t DNSResolver::get_current_time() const {
@@ -43,53 +50,45 @@ void DNSResolver::encode_domain_name(const std::string& domain, std::vector<uint
     for (const auto& label : labels) {
         if (label.length() > 63) return; // Invalid label length
         buffer.push_back(static_cast<uint8_t>(label.length()));
-        for (char c : label) {
-            buffer.push_back(static_cast<uint8_t>(c));
-        }
+        buffer.insert(buffer.end(), label.begin(), label.end());
     }
     buffer.push_back(0); // Null terminator
 }
 
 std::vector<uint8_t> DNSResolver::build_dns_query(const std::string& domain) const {
     // RFC 1035 Section 4.1.1 - Message format
-    std::vector<uint8_t> packet;
-    
-    // Header (12 bytes)
-    uint16_t id = static_cast<uint16_t>(time(nullptr) & 0xFFFF);
-    packet.push_back((id >> 8) & 0xFF);
-    packet.push_back(id & 0xFF);
-    
-    // Flags: Standard query, recursion desired
-    packet.push_back(0x01); // QR=0, Opcode=0, AA=0, TC=0, RD=1
-    packet.push_back(0x00); // RA=0, Z=0, RCODE=0
-    
-    // QDCOUNT: 1 question
-    packet.push_back(0x00);
-    packet.push_back(0x01);
-    
-    // ANCOUNT: 0 answers
-    packet.push_back(0x00);
-    packet.push_back(0x00);
-    
-    // NSCOUNT: 0 authority records
-    packet.push_back(0x00);
-    packet.push_back(0x00);
-    
-    // ARCOUNT: 0 additional records
-    packet.push_back(0x00);
-    packet.push_back(0x00);
-    
+    // Everything in a query except the transaction ID and the domain name is
+    // fixed, so the header and question footer are prebuilt byte templates
+    // rather than being assembled push_back-by-push_back per query
+    static const uint8_t kHeaderTemplate[12] = {
+        0x00, 0x00, // ID (patched below)
+        0x01, 0x00, // QR=0, Opcode=0, AA=0, TC=0, RD=1; RA=0, Z=0, RCODE=0
+        0x00, 0x01, // QDCOUNT: 1 question
+        0x00, 0x00, // ANCOUNT: 0 answers
+        0x00, 0x00, // NSCOUNT: 0 authority records
+        0x00, 0x00, // ARCOUNT: 0 additional records
+    };
+    static const uint8_t kQuestionFooter[4] = {
+        0x00, 0x01, // QTYPE: A record (1)
+        0x00, 0x01, // QCLASS: IN (1)
+    };
+
+    std::vector<uint8_t> packet(kHeaderTemplate, kHeaderTemplate + sizeof(kHeaderTemplate));
+    // Encoded name is domain length + leading label byte + null terminator
+    packet.reserve(sizeof(kHeaderTemplate) + domain.length() + 2 + sizeof(kQuestionFooter));
+
+    // Random transaction ID (RFC 5452): the old time()-based ID repeated
+    // for every query issued within the same second and was predictable,
+    // which weakens the response-ID check against late or spoofed datagrams
+    static thread_local std::mt19937 rng(std::random_device{}());
+    uint16_t id = static_cast<uint16_t>(rng() & 0xFFFF);
+    packet[0] = (id >> 8) & 0xFF;
+    packet[1] = id & 0xFF;
+
     // Question section
     encode_domain_name(domain, packet);
-    
-    // QTYPE: A record (1)
-    packet.push_back(0x00);
-    packet.push_back(0x01);
-    
-    // QCLASS: IN (1)
-    packet.push_back(0x00);
-    packet.push_back(0x01);
-    
+    packet.insert(packet.end(), kQuestionFooter, kQuestionFooter + sizeof(kQuestionFooter));
+
     return packet;
 }
 
@@ -133,7 +132,7 @@ bool DNSResolver::decode_domain_name(const std::vector<uint8_t>& response, size_
     return true;
 }
 
-bool DNSResolver::parse_dns_response(const std::vector<uint8_t>& response, std::string& ip) const {
+bool DNSResolver::parse_dns_response(const std::vector<uint8_t>& response, std::string& ip, uint32_t& ttl) const {
     // RFC 1035 Section 4.1.3 - Response format
     if (response.size() < 12) return false;
     
@@ -164,20 +163,25 @@ bool DNSResolver::parse_dns_response(const std::vector<uint8_t>& response, std::
         pos += 2;
         uint16_t class_val = (response[pos] << 8) | response[pos + 1];
         pos += 2;
-        pos += 4; // Skip TTL
+        uint32_t record_ttl = (static_cast<uint32_t>(response[pos]) << 24) |
+                              (static_cast<uint32_t>(response[pos + 1]) << 16) |
+                              (static_cast<uint32_t>(response[pos + 2]) << 8) |
+                              static_cast<uint32_t>(response[pos + 3]);
+        pos += 4;
         uint16_t rdlength = (response[pos] << 8) | response[pos + 1];
         pos += 2;
-        
+
         // Check if A record (type 1)
         if (type == 1 && class_val == 1 && rdlength == 4) {
             if (pos + 4 > response.size()) break;
-            
+
             // Extract IP address
             char ip_str[16];
             snprintf(ip_str, sizeof(ip_str), "%d.%d.%d.%d",
                     response[pos], response[pos + 1],
                     response[pos + 2], response[pos + 3]);
             ip = ip_str;
+            ttl = record_ttl;
             return true;
         }
         
@@ -193,67 +197,185 @@ std::pair<std::string, double> DNSResolver::resolve(const std::string& domain) {
         return std::make_pair(domain, 0.0);
     }
     
-    // Check cache
-    uint64_t current_time = get_current_time();
-    auto cache_it = cache_.find(domain);
-    if (cache_it != cache_.end() && !cache_it->second.is_expired(current_time)) {
-        return std::make_pair(cache_it->second.ip, 0.0);
+    {
+        std::unique_lock<std::mutex> lock(mutex_);
+
+        // If another thread is already resolving this domain, wait for its
+        // answer instead of racing a duplicate query onto the wire - unless
+        // a stale-but-usable entry exists, in which case the in-flight
+        // query IS the refresh and we can serve stale right away
+        while (inflight_.count(domain) > 0) {
+            uint64_t now = get_current_time();
+            auto it = cache_.find(domain);
+            if (it != cache_.end() &&
+                it->second.is_stale_usable(now, kServeStaleWindowSecs)) {
+                return std::make_pair(it->second.ip, 0.0);
+            }
+            inflight_cv_.wait(lock);
+        }
+
+        // Check cache (again, after any wait - the other thread's answer
+        // normally lands here)
+        uint64_t now = get_current_time();
+        auto cache_it = cache_.find(domain);
+        if (cache_it != cache_.end()) {
+            if (!cache_it->second.is_expired(now)) {
+                return std::make_pair(cache_it->second.ip, 0.0);
+            }
+            if (cache_it->second.is_stale_usable(now, kServeStaleWindowSecs)) {
+                // Serve-stale (RFC 8767): answer from the expired entry now
+                // and refresh off the caller's path. The hot path pays zero
+                // DNS latency for any domain seen within the grace window.
+                std::string stale_ip = cache_it->second.ip;
+                inflight_.insert(domain);
+                active_refreshes_++;
+                std::thread(&DNSResolver::refresh_in_background, this, domain).detach();
+                return std::make_pair(stale_ip, 0.0);
+            }
+        }
+
+        // Miss (or hopelessly stale): this thread owns the query
+        inflight_.insert(domain);
     }
-    
+
+    return query_servers(domain);
+}
+
+void DNSResolver::refresh_in_background(const std::string& domain) {
+    query_servers(domain);
+    // Notify while still holding the lock: the destructor waits on this CV
+    // and tears the object down the moment the count reads zero, so an
+    // unlocked notify could fire on an already-destroyed condition variable
+    std::lock_guard<std::mutex> lock(mutex_);
+    active_refreshes_--;
+    refresh_done_cv_.notify_all();
+}
+
+std::pair<std::string, double> DNSResolver::query_servers(const std::string& domain) {
+    uint64_t current_time = get_current_time();
+
     // Build query packet
     std::vector<uint8_t> query = build_dns_query(domain);
-    
-    // Try each DNS server
-    for (const auto& server : servers_) {
-        socket_t sock = network::create_udp_socket();
-        if (sock == network::INVALID_SOCKET_VALUE) continue;
-        
-        // Set timeout
-        struct timeval timeout;
-        timeout.tv_sec = static_cast<long>(timeout_secs_);
-        timeout.tv_usec = static_cast<long>((timeout_secs_ - timeout.tv_sec) * 1000000);
-        
-#ifdef _WIN32
-        setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, reinterpret_cast<const char*>(&timeout), sizeof(timeout));
-#else
-        setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof(timeout));
-#endif
-        
-        // Send query
-        struct sockaddr_in server_addr;
-        if (!network::ip_to_sockaddr(server.host, server.port, server_addr)) {
-            network::close_socket(sock);
-            continue;
+
+    // Fan the query out to every server at once on one unconnected UDP
+    // socket and take the first valid answer. The old loop queried servers
+    // sequentially and stalled a full timeout on each dead one, so worst
+    // case was N * timeout; fan-out pays one RTT to the fastest live server
+    // and at most a single timeout overall.
+    std::string ip;
+    uint32_t ttl = 0;
+    bool resolved = false;
+
+    socket_t sock = network::create_udp_socket();
+    if (sock != network::INVALID_SOCKET_VALUE) {
+        size_t sent_count = 0;
+        for (const auto& server : servers_) {
+            struct sockaddr_in server_addr;
+            if (!network::ip_to_sockaddr(server.host, server.port, server_addr)) {
+                continue;
+            }
+            ssize_t sent = sendto(sock, reinterpret_cast<const char*>(query.data()),
+                                  static_cast<int>(query.size()), 0,
+                                  reinterpret_cast<struct sockaddr*>(&server_addr),
+                                  sizeof(server_addr));
+            if (sent == static_cast<ssize_t>(query.size())) {
+                sent_count++;
+            }
         }
-        
-        ssize_t sent = sendto(sock, reinterpret_cast<const char*>(query.data()), static_cast<int>(query.size()), 0,
-                              reinterpret_cast<struct sockaddr*>(&server_addr), sizeof(server_addr));
-        if (sent != static_cast<ssize_t>(query.size())) {
-            network::close_socket(sock);
-            continue;
+
+        if (sent_count > 0) {
+            auto deadline = std::chrono::steady_clock::now() +
+                            std::chrono::milliseconds(static_cast<int64_t>(timeout_secs_ * 1000.0));
+            std::vector<uint8_t> response(512);
+
+            while (!resolved) {
+                auto remaining_ms = std::chrono::duration_cast<std::chrono::milliseconds>(
+                    deadline - std::chrono::steady_clock::now()).count();
+                if (remaining_ms <= 0) {
+                    break;
+                }
+
+                socket_t poll_socks[1] = {sock};
+                if (network::poll_sockets(poll_socks, 1, static_cast<int>(remaining_ms)) <= 0) {
+                    break; // Timeout or poll error
+                }
+
+                struct sockaddr_in from_addr;
+                socklen_t from_len = sizeof(from_addr);
+                ssize_t received = recvfrom(sock, reinterpret_cast<char*>(response.data()),
+                                            static_cast<int>(response.size()), 0,
+                                            reinterpret_cast<struct sockaddr*>(&from_addr),
+                                            &from_len);
+                if (received <= 0) {
+                    break;
+                }
+
+                // Drop datagrams that do not echo our transaction ID (late
+                // answers to an earlier query, or spoofing attempts) and
+                // keep waiting for the real one
+                if (received < 2 || response[0] != query[0] || response[1] != query[1]) {
+                    continue;
+                }
+
+                std::vector<uint8_t> packet(response.begin(), response.begin() + received);
+                if (parse_dns_response(packet, ip, ttl)) {
+                    resolved = true;
+                }
+                // A server answering NXDOMAIN/SERVFAIL first does not end
+                // the race: another may still return a usable A record,
+                // matching the old try-the-next-server behavior
+            }
         }
-        
-        // Receive response
-        std::vector<uint8_t> response(512);
-        struct sockaddr_in from_addr;
-        socklen_t from_len = sizeof(from_addr);
-        
-        ssize_t received = recvfrom(sock, reinterpret_cast<char*>(response.data()), static_cast<int>(response.size()), 0,
-                                    reinterpret_cast<struct sockaddr*>(&from_addr), &from_len);
-        
+
         network::close_socket(sock);
-        
-        if (received > 0) {
-            response.resize(static_cast<size_t>(received));
-            std::string ip;
-            if (parse_dns_response(response, ip)) {
-                // Cache with TTL (default 300 seconds)
-                uint64_t expiry = current_time + 300;
-                cache_[domain] = DNSCacheEntry(ip, expiry);
-                return std::make_pair(ip, 0.0); // Simplified timing
+    }
+
+    if (resolved) {
+        // Cache for the TTL the authority actually gave us, clamped:
+        // a floor so TTL=0 answers do not defeat the cache entirely,
+        // a ceiling so stale records cannot pin a dead IP for hours
+        const uint32_t min_ttl = 30;
+        const uint32_t max_ttl = 3600;
+        uint32_t effective_ttl = std::min(std::max(ttl, min_ttl), max_ttl);
+        uint64_t expiry = current_time + effective_ttl;
+        {
+            std::lock_guard<std::mutex> lock(mutex_);
+
+            // Keep the cache bounded: sweep entries past their stale window
+            // first, and only if that freed nothing drop the entry closest
+            // to expiry. The sweep is rare (cap hits only), so the linear
+            // pass does not sit on the resolve hot path.
+            if (cache_.size() >= kMaxCacheEntries && cache_.find(domain) == cache_.end()) {
+                for (auto it = cache_.begin(); it != cache_.end();) {
+                    if (!it->second.is_stale_usable(current_time, kServeStaleWindowSecs)) {
+                        it = cache_.erase(it);
+                    } else {
+                        ++it;
+                    }
+                }
+                if (cache_.size() >= kMaxCacheEntries) {
+                    auto oldest = cache_.begin();
+                    for (auto it = cache_.begin(); it != cache_.end(); ++it) {
+                        if (it->second.expiry_time < oldest->second.expiry_time) {
+                            oldest = it;
+                        }
+                    }
+                    cache_.erase(oldest);
+                }
             }
+
+            cache_[domain] = DNSCacheEntry(ip, expiry);
+            inflight_.erase(domain);
         }
+        inflight_cv_.notify_all();
+        return std::make_pair(ip, 0.0); // Simplified timing
     }
-    
+
+    // Failed on every server - release the domain so waiters can retry
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        inflight_.erase(domain);
+    }
+    inflight_cv_.notify_all();
     return std::make_pair("", 0.0);
 }
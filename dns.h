@@ -4,7 +4,10 @@
 #include <string>
 #include <vector>
 #include <map>
+#include <set>
 #include <memory>
+#include <mutex>
+#include <condition_variable>
 #include <cstdint>
 #include "config.h"
 #include "network.h"
@@ -23,6 +26,11 @@ struct DNSCacheEntry {
     bool is_expired(uint64_t current_time) const {
         return current_time >= expiry_time;
     }
+
+    // Expired, but still inside the serve-stale grace window
+    bool is_stale_usable(uint64_t current_time, uint64_t stale_window_secs) const {
+        return current_time < expiry_time + stale_window_secs;
+    }
 };
 
 class DNSResolver {
@@ -41,18 +49,47 @@ public:
     std::pair<std::string, double> resolve(const std::string& domain);
     
 private:
+    // Serve-stale (RFC 8767): an expired entry may still be handed out for
+    // this long past its TTL while a background query refreshes it, so warm
+    // domains never block on the wire
+    static constexpr uint64_t kServeStaleWindowSecs = 300;
+    // Cache cap; beyond it, entries past their stale window are swept and
+    // then the soonest-to-expire entry is dropped
+    static constexpr size_t kMaxCacheEntries = 4096;
+
     std::vector<DNSServerConfig> servers_;
     double timeout_secs_;
     std::map<std::string, DNSCacheEntry> cache_;
-    
+
+    // The resolver is shared by connection threads and health workers.
+    // mutex_ guards cache_ and inflight_; inflight_ holds domains with a
+    // query currently on the wire so concurrent misses for the same domain
+    // coalesce into a single UDP query (single-flight)
+    std::mutex mutex_;
+    std::condition_variable inflight_cv_;
+    std::set<std::string> inflight_;
+
+    // Background serve-stale refreshes currently running; the destructor
+    // waits for them so a detached refresh never outlives the resolver
+    size_t active_refreshes_;
+    std::condition_variable refresh_done_cv_;
+
     // Get current Unix timestamp
     uint64_t get_current_time() const;
+
+    // Send the query and cache the answer. The caller must already have
+    // placed domain in inflight_; this releases it and wakes waiters.
+    std::pair<std::string, double> query_servers(const std::string& domain);
+
+    // query_servers wrapper for detached serve-stale refresh threads
+    void refresh_in_background(const std::string& domain);
     
     // Build DNS query packet (RFC 1035 Section 4.1.1)
     std::vector<uint8_t> build_dns_query(const std::string& domain) const;
     
     // Parse DNS response packet (RFC 1035 Section 4.1.3)
-    bool parse_dns_response(const std::vector<uint8_t>& response, std::string& ip) const;
+    // On success also reports the answer's TTL in seconds
+    bool parse_dns_response(const std::vector<uint8_t>& response, std::string& ip, uint32_t& ttl) const;
     
     // Encode domain name for DNS (RFC 1035 Section 3.1)
     void encode_domain_name(const std::string& domain, std::vector<uint8_t>& buffer) const;
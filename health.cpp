@@ -1,7 +1,12 @@
 #include "health.h"
+#include "logger.h"
 #include <chrono>
 #include <thread>
 #include <algorithm>
+#include <atomic>
+#include <random>
+#include <vector>
+#include <map>
 
 // Undefine Windows min/max macros that conflict with std::min/std::max
 #ifdef _WIN32
@@ -16,11 +21,15 @@
 HealthMonitor::HealthMonitor(
     std::shared_ptr<RunwayManager> runway_manager,
     std::shared_ptr<TargetAccessibilityTracker> tracker,
-    uint64_t interval_secs)
+    uint64_t interval_secs,
+    size_t probe_concurrency)
     : runway_manager_(runway_manager)
     , tracker_(tracker)
     , interval_secs_(interval_secs)
-    , running_(false) {
+    , probe_concurrency_(probe_concurrency > 0 ? probe_concurrency : 1)
+    , running_(false)
+    , next_job_(0)
+    , jobs_remaining_(0) {
 }
 
 HealthMonitor::~HealthMonitor() {
@@ -34,31 +43,58 @@ void HealthMonitor::start() {
     
     running_ = true;
     monitor_thread_ = std::thread(&HealthMonitor::monitor_loop, this);
+
+    // Probe workers outlive individual cycles; they idle on jobs_cv_ between
+    // batches instead of being spawned and joined every interval
+    for (size_t t = 0; t < probe_concurrency_; ++t) {
+        probe_workers_.emplace_back(&HealthMonitor::probe_worker_loop, this);
+    }
 }
 
 void HealthMonitor::stop() {
     if (!running_) {
         return;
     }
-    
-    running_ = false;
-    
+
+    // Flip the flag under jobs_mutex_: both waiters evaluate running_ in
+    // predicates held under that mutex, and a flip+notify squeezed between
+    // a predicate check and the block would be a lost wakeup - the worker
+    // sleeps forever and join() below hangs
+    {
+        std::lock_guard<std::mutex> lock(jobs_mutex_);
+        running_ = false;
+    }
+    jobs_cv_.notify_all();
+    batch_done_cv_.notify_all();
+
     if (monitor_thread_.joinable()) {
         monitor_thread_.join();
     }
+    for (auto& worker : probe_workers_) {
+        if (worker.joinable()) {
+            worker.join();
+        }
+    }
+    probe_workers_.clear();
 }
 
 void HealthMonitor::monitor_loop() {
+    // Jitter the interval (up to 10%) so probe cycles from restarts or
+    // multiple instances don't synchronize into a thundering herd
+    std::mt19937 rng(std::random_device{}());
+    std::uniform_int_distribution<uint64_t> jitter_ms(0, interval_secs_ * 100);
+
     while (running_) {
         try {
             health_check_cycle();
         } catch (...) {
             // Defensive: continue on errors
         }
-        
-        // Sleep for interval
-        for (uint64_t i = 0; i < interval_secs_ && running_; ++i) {
-            std::this_thread::sleep_for(std::chrono::seconds(1));
+
+        // Sleep for interval plus jitter, staying responsive to stop()
+        uint64_t sleep_ms = interval_secs_ * 1000 + jitter_ms(rng);
+        for (uint64_t slept = 0; slept < sleep_ms && running_; slept += 100) {
+            std::this_thread::sleep_for(std::chrono::milliseconds(100));
         }
     }
 }
@@ -76,57 +112,141 @@ void HealthMonitor::health_check_cycle() {
     // Limit targets per cycle to avoid overload
     const size_t max_targets_per_cycle = 10;
     size_t targets_to_check = std::min(targets.size(), max_targets_per_cycle);
-    
+
+    // Collect this cycle's probe jobs first, then run them below with
+    // bounded concurrency. Each target is resolved once per cycle here on
+    // the monitor thread; probing a target over N runways used to resolve
+    // it N times (cheap cache hits, but N lock round-trips per target).
+    std::vector<std::pair<std::string, std::string>> jobs; // (target, runway_id)
+    std::map<std::string, std::string> resolved_ips;       // target -> ip ("" = failed)
+
+    // Skip runways probed recently - by the previous cycle or by a
+    // connection-triggered probe race - so a steady-state cycle only pays
+    // for entries whose information has actually aged out. Same monotonic
+    // clock as the tracker's attempt timestamps.
+    uint64_t now = static_cast<uint64_t>(std::chrono::duration_cast<std::chrono::seconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count());
+    uint64_t min_probe_age = interval_secs_ / 2;
+    if (min_probe_age == 0) {
+        min_probe_age = 1;
+    }
+
     for (size_t i = 0; i < targets_to_check; ++i) {
         const std::string& target = targets[i];
-        
+
         try {
+            resolved_ips[target] = runway_manager_->resolve_target(target);
             auto metrics = tracker_->get_target_metrics(target);
-            
-            // Prioritize recently failed runways
-            std::vector<std::string> failed_runways;
+
+            // Prioritize recently failed runways (limit to 5 per target)
+            size_t failed_count = 0;
             for (const auto& pair : metrics) {
-                if (pair.second.state == RunwayState::Inaccessible) {
-                    failed_runways.push_back(pair.first);
+                if (pair.second.state == RunwayState::Inaccessible && failed_count < 5) {
+                    uint64_t last_probe = std::max(pair.second.last_success_time,
+                                                   pair.second.last_failure_time);
+                    if (now - last_probe < min_probe_age) {
+                        continue; // Verdict still fresh
+                    }
+                    jobs.emplace_back(target, pair.first);
+                    failed_count++;
                 }
             }
-            
-            // Test failed runways (limit to 5 per target)
-            size_t max_failed = std::min(failed_runways.size(), size_t(5));
-            for (size_t j = 0; j < max_failed; ++j) {
-                auto runway = runway_manager_->get_runway(failed_runways[j]);
-                if (runway) {
-                    auto result = runway_manager_->test_runway_accessibility(
-                        target, runway, 5.0);
-                    bool net_success = std::get<0>(result);
-                    bool user_success = std::get<1>(result);
-                    double response_time = std::get<2>(result);
-                    tracker_->update(target, runway->id, net_success, user_success, response_time);
-                }
-            }
-            
+
             // Also test partially accessible runways (limit to 3 per target)
-            std::vector<std::string> partial_runways;
+            size_t partial_count = 0;
             for (const auto& pair : metrics) {
-                if (pair.second.state == RunwayState::PartiallyAccessible) {
-                    partial_runways.push_back(pair.first);
+                if (pair.second.state == RunwayState::PartiallyAccessible && partial_count < 3) {
+                    uint64_t last_probe = std::max(pair.second.last_success_time,
+                                                   pair.second.last_failure_time);
+                    if (now - last_probe < min_probe_age) {
+                        continue;
+                    }
+                    jobs.emplace_back(target, pair.first);
+                    partial_count++;
                 }
             }
-            
-            size_t max_partial = std::min(partial_runways.size(), size_t(3));
-            for (size_t j = 0; j < max_partial; ++j) {
-                auto runway = runway_manager_->get_runway(partial_runways[j]);
-                if (runway) {
-                    auto result = runway_manager_->test_runway_accessibility(
-                        target, runway, 5.0);
+        } catch (...) {
+            // Defensive: continue on errors
+        }
+    }
+
+    if (jobs.empty()) {
+        return;
+    }
+
+    // Hand the batch to the persistent workers and wait for it to drain.
+    // Bounded concurrency for the same reason as before - a serial cycle of
+    // N probes at up to 5 s each can overrun the monitor interval, while
+    // unbounded fan-out would burst sockets - but the pool now lives across
+    // cycles instead of being spawned and joined every interval.
+    std::unique_lock<std::mutex> lock(jobs_mutex_);
+    jobs_ = std::move(jobs);
+    resolved_ips_ = std::move(resolved_ips);
+    next_job_ = 0;
+    jobs_remaining_ = jobs_.size();
+    jobs_cv_.notify_all();
+
+    batch_done_cv_.wait(lock, [this]() {
+        return jobs_remaining_ == 0 || !running_;
+    });
+}
+
+void HealthMonitor::probe_worker_loop() {
+    while (true) {
+        std::string target;
+        std::string runway_id;
+        std::string resolved_ip;
+        {
+            std::unique_lock<std::mutex> lock(jobs_mutex_);
+            jobs_cv_.wait(lock, [this]() {
+                return !running_ || next_job_ < jobs_.size();
+            });
+            if (!running_) {
+                return;
+            }
+            size_t idx = next_job_++;
+            target = jobs_[idx].first;
+            runway_id = jobs_[idx].second;
+            auto res_it = resolved_ips_.find(target);
+            if (res_it != resolved_ips_.end()) {
+                resolved_ip = res_it->second;
+            }
+        }
+
+        auto runway = runway_manager_->get_runway(runway_id);
+        if (runway) {
+            if (resolved_ip.empty()) {
+                // Resolution failed this cycle: record the failure without
+                // dialing anything
+                tracker_->update(target, runway->id, false, false, 0.0);
+                Logger::instance().log_throttled(LogLevel::WARN, "resolve:" + target,
+                    "Health probe: resolution failed for " + target);
+            } else {
+                try {
+                    auto result = runway_manager_->test_runway_accessibility_resolved(
+                        resolved_ip, runway, 5.0);
                     bool net_success = std::get<0>(result);
                     bool user_success = std::get<1>(result);
                     double response_time = std::get<2>(result);
                     tracker_->update(target, runway->id, net_success, user_success, response_time);
+                    if (!net_success) {
+                        // Throttled: a dead target is re-probed every cycle
+                        // and would otherwise repeat this line each time
+                        Logger::instance().log_throttled(LogLevel::WARN,
+                            target + "/" + runway->id,
+                            "Health probe failed: " + target + " via " + runway->id);
+                    }
+                } catch (...) {
+                    // Defensive: continue on errors
                 }
             }
-        } catch (...) {
-            // Defensive: continue on errors
+        }
+
+        {
+            std::lock_guard<std::mutex> lock(jobs_mutex_);
+            if (--jobs_remaining_ == 0) {
+                batch_done_cv_.notify_all();
+            }
         }
     }
 }
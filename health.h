@@ -4,6 +4,12 @@
 #include <thread>
 #include <atomic>
 #include <memory>
+#include <mutex>
+#include <condition_variable>
+#include <map>
+#include <string>
+#include <utility>
+#include <vector>
 #include "runway_manager.h"
 #include "tracker.h"
 
@@ -11,7 +17,8 @@ class HealthMonitor {
 public:
     HealthMonitor(std::shared_ptr<RunwayManager> runway_manager,
                   std::shared_ptr<TargetAccessibilityTracker> tracker,
-                  uint64_t interval_secs);
+                  uint64_t interval_secs,
+                  size_t probe_concurrency = 4);
     
     ~HealthMonitor();
     
@@ -27,11 +34,28 @@ private:
     std::shared_ptr<RunwayManager> runway_manager_;
     std::shared_ptr<TargetAccessibilityTracker> tracker_;
     uint64_t interval_secs_;
+    size_t probe_concurrency_;
     std::atomic<bool> running_;
     std::thread monitor_thread_;
-    
+
+    // Persistent probe workers, started once with the monitor and reused by
+    // every cycle: spawning/joining a fresh pool per cycle paid the thread
+    // startup cost over and over for the same fixed concurrency. The monitor
+    // publishes a batch of (target, runway_id) jobs plus this cycle's
+    // resolved IPs, workers drain it, and the monitor waits until the batch
+    // count reaches zero.
+    std::vector<std::thread> probe_workers_;
+    std::mutex jobs_mutex_;
+    std::condition_variable jobs_cv_;       // Wakes workers when a batch lands
+    std::condition_variable batch_done_cv_; // Wakes the monitor when it drains
+    std::vector<std::pair<std::string, std::string>> jobs_; // (target, runway_id)
+    std::map<std::string, std::string> resolved_ips_; // target -> ip ("" = failed)
+    size_t next_job_;
+    size_t jobs_remaining_;
+
     void monitor_loop();
     void health_check_cycle();
+    void probe_worker_loop();
 };
 
 #endif // HEALTH_H
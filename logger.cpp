@@ -18,7 +18,7 @@ void Logger::init(const std::string& log_file) {
     }
     
     log_file_ = log_file;
-    
+
     // Ensure log directory exists
     if (!log_file_.empty()) {
         utils::ensure_log_file(log_file_);
@@ -26,38 +26,104 @@ void Logger::init(const std::string& log_file) {
         // std::ios::app ensures writes go to end of file
         file_stream_.open(log_file_, std::ios::app | std::ios::out);
         if (file_stream_.is_open()) {
-            // Ensure immediate writes by setting unitbuf (flush after each output operation)
-            file_stream_.setf(std::ios::unitbuf);
             initialized_ = true;
+            stop_writer_ = false;
+            writer_thread_ = std::thread(&Logger::writer_loop, this);
         } else {
             initialized_ = false;
         }
     }
 }
 
+void Logger::enqueue(QueuedRecord&& record) {
+    // Flag check outside any lock: when logging is off this is one atomic
+    // load, and when it is on the only lock taken is the narrow queue one
+    if (!initialized_.load()) {
+        return;
+    }
+    {
+        std::lock_guard<std::mutex> lock(queue_mutex_);
+        queue_.push_back(std::move(record));
+    }
+    queue_cv_.notify_one();
+}
+
+void Logger::writer_loop() {
+    std::deque<QueuedRecord> batch;
+
+    while (true) {
+        {
+            std::unique_lock<std::mutex> lock(queue_mutex_);
+            writer_idle_ = true;
+            drained_cv_.notify_all();
+            queue_cv_.wait(lock, [this]() { return stop_writer_ || !queue_.empty(); });
+
+            if (queue_.empty() && stop_writer_) {
+                return;
+            }
+
+            writer_idle_ = false;
+            batch.swap(queue_);
+        }
+
+        // Format and write outside the lock; one flush per batch instead of
+        // one per record
+        for (const auto& record : batch) {
+            write_record(record);
+        }
+        file_stream_.flush();
+        batch.clear();
+    }
+}
+
 void Logger::log(LogLevel level, const std::string& message) {
-    std::lock_guard<std::mutex> lock(mutex_);
-    
-    if (!initialized_ || !file_stream_.is_open()) {
+    // Drop filtered records before taking the lock or formatting anything
+    if (!should_log(level)) {
         return;
     }
-    
-    uint64_t timestamp = std::time(nullptr);
-    std::string level_str = level_to_string(level);
-    std::string time_str = format_timestamp(timestamp);
-    
-    // Format: timestamp level message
-    file_stream_ << time_str << " [" << level_str << "] " << message << "\n";
-    file_stream_.flush(); // Ensure immediate write to disk
+
+    QueuedRecord record;
+    record.timestamp = std::time(nullptr);
+    record.level = level;
+    record.message = message;
+    enqueue(std::move(record));
+}
+
+void Logger::log_throttled(LogLevel level, const std::string& key,
+                           const std::string& message, uint64_t min_interval_secs) {
+    if (!should_log(level)) {
+        return;
+    }
+
+    uint64_t now = static_cast<uint64_t>(std::time(nullptr));
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        uint64_t& last_emit = throttle_last_emit_[key];
+        if (last_emit != 0 && now - last_emit < min_interval_secs) {
+            return; // Suppressed: same key logged too recently
+        }
+        last_emit = now;
+    }
+
+    log(level, message);
 }
 
 void Logger::log_connection(const ConnectionLog& conn_log) {
-    std::lock_guard<std::mutex> lock(mutex_);
-    
-    if (!initialized_ || !file_stream_.is_open()) {
+    QueuedRecord record;
+    record.is_connection = true;
+    record.timestamp = conn_log.timestamp;
+    record.conn = conn_log;
+    enqueue(std::move(record));
+}
+
+void Logger::write_record(const QueuedRecord& record) {
+    if (!record.is_connection) {
+        file_stream_ << format_timestamp(record.timestamp) << " ["
+                     << level_to_string(record.level) << "] " << record.message << "\n";
         return;
     }
-    
+
+    const ConnectionLog& conn_log = record.conn;
     std::stringstream json;
     json << std::fixed << std::setprecision(2);
     
@@ -103,25 +169,46 @@ void Logger::log_connection(const ConnectionLog& conn_log) {
         json << ",\"error\":\"" << escape_json_string(conn_log.error) << "\"";
     }
     
-    json << "}\n";
-    
-    file_stream_ << json.str();
-    file_stream_.flush(); // Ensure immediate write to disk
+    json << "}";
+
+    file_stream_ << json.str() << "\n";
 }
 
 void Logger::flush() {
-    std::lock_guard<std::mutex> lock(mutex_);
-    if (file_stream_.is_open()) {
-        file_stream_.flush();
+    // Wait until the writer thread has drained everything queued so far;
+    // the writer flushes the stream itself after each batch
+    if (!initialized_.load()) {
+        return;
     }
+    std::unique_lock<std::mutex> lock(queue_mutex_);
+    drained_cv_.wait(lock, [this]() { return queue_.empty() && writer_idle_; });
 }
 
 void Logger::close() {
+    // Drop the flag first so late enqueues become no-ops instead of landing
+    // in a queue the writer is about to abandon
+    initialized_.store(false);
+    {
+        std::lock_guard<std::mutex> lock(queue_mutex_);
+        stop_writer_ = true;
+    }
+    queue_cv_.notify_all();
+
+    // Writer drains any queued records before exiting
+    if (writer_thread_.joinable()) {
+        writer_thread_.join();
+    }
+
+    {
+        std::lock_guard<std::mutex> lock(queue_mutex_);
+        stop_writer_ = false;
+    }
+
     std::lock_guard<std::mutex> lock(mutex_);
     if (file_stream_.is_open()) {
+        file_stream_.flush();
         file_stream_.close();
     }
-    initialized_ = false;
 }
 
 std::string Logger::format_timestamp(uint64_t timestamp) {
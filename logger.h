@@ -3,7 +3,12 @@
 
 #include <string>
 #include <fstream>
+#include <map>
+#include <deque>
 #include <mutex>
+#include <atomic>
+#include <thread>
+#include <condition_variable>
 #include <ctime>
 #include <cstdint>
 #include <sstream>
@@ -55,18 +60,67 @@ public:
     void log_connection(const ConnectionLog& conn_log);
     void flush();
     void close();
-    
+
+    // Minimum level actually written; records below it are dropped before
+    // any formatting happens
+    void set_min_level(LogLevel level) { min_level_.store(static_cast<int>(level)); }
+
+    // Cheap pre-check so hot paths can skip building the message string
+    // entirely when the record would be dropped anyway
+    bool should_log(LogLevel level) const {
+        return static_cast<int>(level) >= min_level_.load();
+    }
+
+    // Rate-limited logging for per-probe/per-connection noise: at most one
+    // message per key per min_interval_secs, the rest are dropped
+    void log_throttled(LogLevel level, const std::string& key,
+                       const std::string& message, uint64_t min_interval_secs = 10);
+
 private:
-    Logger() : log_file_(), file_stream_(), mutex_(), initialized_(false) {}
+    Logger() : log_file_(), file_stream_(), mutex_(), initialized_(false)
+             , min_level_(static_cast<int>(LogLevel::INFO))
+             , stop_writer_(false), writer_idle_(true) {}
     ~Logger() { close(); }
     Logger(const Logger&) = delete;
     Logger& operator=(const Logger&) = delete;
-    
+
+    // A queued record; formatting happens on the writer thread, not on the
+    // connection/probe thread that logged it
+    struct QueuedRecord {
+        bool is_connection;
+        uint64_t timestamp;
+        LogLevel level;
+        std::string message;
+        ConnectionLog conn;
+
+        QueuedRecord() : is_connection(false), timestamp(0), level(LogLevel::INFO) {}
+    };
+
     std::string log_file_;
     std::ofstream file_stream_;
+    // Guards the file stream and throttle map. The hot enqueue path
+    // deliberately never takes this lock
     std::mutex mutex_;
-    bool initialized_;
-    
+    std::atomic<bool> initialized_;
+    std::atomic<int> min_level_;
+    std::map<std::string, uint64_t> throttle_last_emit_; // key -> unix timestamp
+
+    // Background writer: log() only enqueues; this thread formats, writes
+    // and flushes, so callers never block on disk I/O. queue_mutex_ guards
+    // only queue_ and the writer flags, so an enqueue holds it for one
+    // deque push
+    std::mutex queue_mutex_;
+    std::deque<QueuedRecord> queue_;
+    std::condition_variable queue_cv_;
+    std::condition_variable drained_cv_;
+    std::thread writer_thread_;
+    bool stop_writer_;
+    bool writer_idle_;
+
+    void writer_loop();
+    void enqueue(QueuedRecord&& record);
+    void write_record(const QueuedRecord& record); // Writer thread only
+
     std::string format_timestamp(uint64_t timestamp);
     std::string escape_json_string(const std::string& str);
     std::string level_to_string(LogLevel level);
@@ -99,6 +99,13 @@ int main(int /*argc*/, char* /*argv*/[]) {
         } else {
             // Initialize logger
             Logger::instance().init(config.log_file);
+            if (config.log_level == "DEBUG") {
+                Logger::instance().set_min_level(LogLevel::DEBUG);
+            } else if (config.log_level == "WARN") {
+                Logger::instance().set_min_level(LogLevel::WARN);
+            } else if (config.log_level == "ERROR") {
+                Logger::instance().set_min_level(LogLevel::ERROR_LEVEL);
+            }
             Logger::instance().log(LogLevel::INFO, "Smart Proxy Service starting");
         }
     }
@@ -138,7 +145,8 @@ int main(int /*argc*/, char* /*argv*/[]) {
     
     // Initialize health monitor
     std::shared_ptr<HealthMonitor> health_monitor = std::make_shared<HealthMonitor>(
-        runway_manager, tracker, config.health_check_interval);
+        runway_manager, tracker, config.health_check_interval,
+        config.probe_concurrency);
     
     // Start proxy server
     if (!proxy_server->start()) {
@@ -3,6 +3,10 @@
 #include <cerrno>
 #include <stdexcept>
 
+#ifndef _WIN32
+#include <netinet/tcp.h> // TCP_NODELAY, TCP_QUICKACK, TCP_FASTOPEN
+#endif
+
 #ifdef _WIN32
 #pragma comment(lib, "ws2_32.lib")
 static bool winsock_initialized = false;
@@ -85,6 +89,18 @@ bool listen_socket(socket_t sock, int backlog) {
 #endif
 }
 
+bool enable_tcp_fastopen(socket_t sock, int queue_len) {
+#if defined(__linux__) && defined(TCP_FASTOPEN)
+    return setsockopt(sock, IPPROTO_TCP, TCP_FASTOPEN,
+                      reinterpret_cast<const char*>(&queue_len),
+                      sizeof(queue_len)) == 0;
+#else
+    (void)sock;
+    (void)queue_len;
+    return false;
+#endif
+}
+
 socket_t accept_connection(socket_t sock, std::string& client_ip, uint16_t& client_port) {
     struct sockaddr_in client_addr;
     socklen_t addr_len = sizeof(client_addr);
@@ -104,22 +120,76 @@ socket_t accept_connection(socket_t sock, std::string& client_ip, uint16_t& clie
     return client_sock;
 }
 
-bool connect_socket(socket_t sock, const std::string& host, uint16_t port) {
+bool connect_with_timeout(socket_t sock, const std::string& host, uint16_t port,
+                          double timeout_secs) {
     struct sockaddr_in addr;
-    std::memset(&addr, 0, sizeof(addr));
-    addr.sin_family = AF_INET;
-    addr.sin_port = htons(port);
-    
-    if (inet_pton(AF_INET, host.c_str(), &addr.sin_addr) != 1) {
+    if (!ip_to_sockaddr(host, port, addr)) {
         return false;
     }
-    
+
+    if (!set_nonblocking(sock)) {
+        return false;
+    }
+
     int result = connect(sock, reinterpret_cast<struct sockaddr*>(&addr), sizeof(addr));
+    bool in_progress = false;
 #ifdef _WIN32
-    return result != SOCKET_ERROR;
+    if (result == SOCKET_ERROR) {
+        in_progress = (WSAGetLastError() == WSAEWOULDBLOCK);
+        if (!in_progress) return false;
+    }
 #else
-    return result == 0;
+    if (result != 0) {
+        in_progress = (errno == EINPROGRESS);
+        if (!in_progress) return false;
+    }
+#endif
+
+    if (in_progress) {
+        int timeout_ms = static_cast<int>(timeout_secs * 1000.0);
+#ifdef _WIN32
+        fd_set writefds;
+        FD_ZERO(&writefds);
+        FD_SET(sock, &writefds);
+        struct timeval timeout;
+        timeout.tv_sec = timeout_ms / 1000;
+        timeout.tv_usec = (timeout_ms % 1000) * 1000;
+        int ready = select(0, nullptr, &writefds, nullptr, &timeout);
+        if (ready <= 0) {
+            return false; // Timeout or error
+        }
+#else
+        struct pollfd pfd;
+        pfd.fd = sock;
+        pfd.events = POLLOUT;
+        pfd.revents = 0;
+        int ready = poll(&pfd, 1, timeout_ms);
+        if (ready <= 0) {
+            return false; // Timeout or error
+        }
+#endif
+
+        // Writable does not mean connected - check SO_ERROR
+        int sock_error = 0;
+        socklen_t len = sizeof(sock_error);
+        if (getsockopt(sock, SOL_SOCKET, SO_ERROR,
+                       reinterpret_cast<char*>(&sock_error), &len) != 0 || sock_error != 0) {
+            return false;
+        }
+    }
+
+    // Restore blocking mode for callers that use blocking send/recv
+#ifdef _WIN32
+    u_long mode = 0;
+    ioctlsocket(sock, FIONBIO, &mode);
+#else
+    int flags = fcntl(sock, F_GETFL, 0);
+    if (flags >= 0) {
+        fcntl(sock, F_SETFL, flags & ~O_NONBLOCK);
+    }
 #endif
+
+    return true;
 }
 
 bool set_nonblocking(socket_t sock) {
@@ -133,6 +203,29 @@ bool set_nonblocking(socket_t sock) {
 #endif
 }
 
+bool bind_to_device(socket_t sock, const std::string& interface_name) {
+#ifdef __linux__
+    if (interface_name.empty()) {
+        return false;
+    }
+    return setsockopt(sock, SOL_SOCKET, SO_BINDTODEVICE,
+                      interface_name.c_str(),
+                      static_cast<socklen_t>(interface_name.size() + 1)) == 0;
+#else
+    (void)sock;
+    (void)interface_name;
+    return false;
+#endif
+}
+
+void tune_relay_socket(socket_t sock) {
+    set_socket_option(sock, IPPROTO_TCP, TCP_NODELAY, 1);
+    set_socket_option(sock, SOL_SOCKET, SO_KEEPALIVE, 1);
+#if defined(__linux__) && defined(TCP_QUICKACK)
+    set_socket_option(sock, IPPROTO_TCP, TCP_QUICKACK, 1);
+#endif
+}
+
 bool set_socket_option(socket_t sock, int level, int optname, int value) {
     int result = setsockopt(sock, level, optname, reinterpret_cast<const char*>(&value), sizeof(value));
 #ifdef _WIN32
@@ -150,6 +243,21 @@ void close_socket(socket_t sock) {
 #endif
 }
 
+void abortive_close(socket_t sock) {
+    if (sock == INVALID_SOCKET_VALUE) {
+        return;
+    }
+    struct linger lg;
+    lg.l_onoff = 1;
+    lg.l_linger = 0;
+#ifdef _WIN32
+    setsockopt(sock, SOL_SOCKET, SO_LINGER, reinterpret_cast<const char*>(&lg), sizeof(lg));
+#else
+    setsockopt(sock, SOL_SOCKET, SO_LINGER, &lg, sizeof(lg));
+#endif
+    close_socket(sock);
+}
+
 ssize_t send_data(socket_t sock, const void* data, size_t len) {
 #ifdef _WIN32
     int result = send(sock, reinterpret_cast<const char*>(data), static_cast<int>(len), 0);
@@ -231,33 +339,6 @@ int poll_sockets(socket_t* sockets, int count, int timeout_ms) {
 #endif
 }
 
-bool resolve_hostname(const std::string& hostname, std::string& ip) {
-    struct addrinfo hints, *result = nullptr;
-    std::memset(&hints, 0, sizeof(hints));
-    hints.ai_family = AF_INET;
-    hints.ai_socktype = SOCK_STREAM;
-    
-    int err = getaddrinfo(hostname.c_str(), nullptr, &hints, &result);
-    if (err != 0) {
-        return false;
-    }
-    
-    bool found = false;
-    for (struct addrinfo* rp = result; rp != nullptr; rp = rp->ai_next) {
-        if (rp->ai_family == AF_INET) {
-            struct sockaddr_in* addr = reinterpret_cast<struct sockaddr_in*>(rp->ai_addr);
-            char ip_str[INET_ADDRSTRLEN];
-            if (inet_ntop(AF_INET, &addr->sin_addr, ip_str, INET_ADDRSTRLEN) != nullptr) {
-                ip = ip_str;
-                found = true;
-                break;
-            }
-        }
-    }
-    
-    freeaddrinfo(result);
-    return found;
-}
 
 std::string get_last_error() {
 #ifdef _WIN32
@@ -59,21 +59,56 @@ bool bind_socket(socket_t sock, const std::string& host, uint16_t port);
 // Listen on socket
 bool listen_socket(socket_t sock, int backlog = 128);
 
+// Enable TCP Fast Open on a listening socket (RFC 7413): returning clients
+// with a cached cookie can carry their first request on the SYN, saving an
+// RTT. Purely opportunistic - clients that don't use TFO are unaffected.
+// Linux-only (and needs net.ipv4.tcp_fastopen to allow server mode);
+// returns false elsewhere.
+bool enable_tcp_fastopen(socket_t sock, int queue_len = 128);
+
 // Accept connection
 socket_t accept_connection(socket_t sock, std::string& client_ip, uint16_t& client_port);
 
-// Connect to remote host
-bool connect_socket(socket_t sock, const std::string& host, uint16_t port);
+// Connect to remote host with a bounded timeout
+// Uses a non-blocking connect() + poll()/select() wait: SO_SNDTIMEO does not
+// reliably bound connect() duration, so blocking probes could hang well past
+// their budget. The socket is returned to blocking mode on success.
+bool connect_with_timeout(socket_t sock, const std::string& host, uint16_t port,
+                          double timeout_secs);
 
 // Set socket to non-blocking mode
 bool set_nonblocking(socket_t sock);
 
+// Bind the socket to a network interface by name (SO_BINDTODEVICE).
+// Stronger than binding to the interface's address: the kernel pins routing
+// to the device, so traffic cannot leak out another interface that happens
+// to have a matching route. Linux-only and needs CAP_NET_RAW; returns false
+// elsewhere or without the capability so callers can fall back to an
+// address bind.
+bool bind_to_device(socket_t sock, const std::string& interface_name);
+
 // Set socket options (SO_REUSEADDR, etc.)
 bool set_socket_option(socket_t sock, int level, int optname, int value);
 
+// Standard tuning for sockets that carry proxied traffic: TCP_NODELAY so
+// small request/response writes are not held back by Nagle, SO_KEEPALIVE so
+// the kernel notices silently dead peers, and on Linux TCP_QUICKACK so the
+// handshake-heavy exchanges (CONNECT, probe HEADs) are not taxed by the
+// delayed-ACK timer. Send/receive buffer sizes are deliberately left to the
+// kernel: a fixed SO_SNDBUF/SO_RCVBUF disables autotuning, which can grow
+// well past any constant we would pick here.
+void tune_relay_socket(socket_t sock);
+
 // Close socket
 void close_socket(socket_t sock);
 
+// Close abortively: SO_LINGER {on, 0} turns close() into an RST, so the
+// kernel does not park the local port in TIME_WAIT. Meant for connections
+// already known dead or out of protocol sync (stale pool entries, probe
+// discards) - a graceful FIN handshake buys nothing there, and probing
+// every interval would otherwise accumulate TIME_WAIT sockets.
+void abortive_close(socket_t sock);
+
 // Send data (returns bytes sent, -1 on error)
 ssize_t send_data(socket_t sock, const void* data, size_t len);
 
@@ -84,9 +119,6 @@ ssize_t recv_data(socket_t sock, void* buffer, size_t len, int flags = 0);
 // Returns number of ready sockets, -1 on error
 int poll_sockets(socket_t* sockets, int count, int timeout_ms);
 
-// Resolve hostname to IP address (getaddrinfo)
-bool resolve_hostname(const std::string& hostname, std::string& ip);
-
 // Get last error message
 std::string get_last_error();
 
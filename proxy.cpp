@@ -4,16 +4,94 @@
 #include <sstream>
 #include <algorithm>
 #include <ctime>
+#include <cctype>
 #include <mutex>
+#include <condition_variable>
+#include <cerrno>
 #ifdef _WIN32
 #include <winsock2.h>
 #else
 #include <sys/socket.h>
+#include <netinet/tcp.h>
 #endif
 
 // RFC 7230 - HTTP/1.1 Message Syntax and Routing
 // RFC 7231 - HTTP/1.1 Semantics and Content
 
+namespace {
+
+// Canned error responses. These are sent on hot failure paths; building
+// them through HTTPResponse/ostringstream each time is wasted work for
+// bytes that never change.
+const char kBadRequestResponse[] = "HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n";
+const char kBadGatewayResponse[] = "HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\n\r\n";
+const char kProxyAuthRequiredResponse[] =
+    "HTTP/1.1 407 Proxy Authentication Required\r\n"
+    "Proxy-Authenticate: Basic realm=\"smartproxy\"\r\n"
+    "Content-Length: 0\r\n\r\n";
+const char kConnectionEstablished[] = "HTTP/1.1 200 Connection Established\r\n\r\n";
+const char kServiceUnavailableResponse[] =
+    "HTTP/1.1 503 Service Unavailable\r\n"
+    "Connection: close\r\n"
+    "Content-Length: 0\r\n\r\n";
+
+void send_canned_response(socket_t sock, const char* response, size_t len) {
+    network::send_data(sock, response, len);
+}
+
+// Send an entire buffer, retrying on partial sends.
+// send() may write fewer bytes than requested on a non-blocking or
+// buffer-limited socket; callers that ignore the return value can
+// silently truncate requests.
+bool send_all(socket_t sock, const void* data, size_t len) {
+    const char* ptr = static_cast<const char*>(data);
+    size_t remaining = len;
+    while (remaining > 0) {
+        ssize_t sent = network::send_data(sock, ptr, remaining);
+        if (sent <= 0) {
+            // 0 here means the send timed out (SO_SNDTIMEO) on these
+            // blocking sockets - treat it as a failure, not progress
+            return false;
+        }
+        ptr += sent;
+        remaining -= static_cast<size_t>(sent);
+    }
+    return true;
+}
+
+// Ties a connection's bookkeeping to its handler's scope: the destructor
+// drops the live-connections map entry and releases the active slot on
+// every exit path. The active count doubles as the admission gate's load
+// measure, so pairing the decrement by hand across a dozen early returns
+// is how leaks creep in - and a leaked slot never comes back, eventually
+// turning the 503 gate permanently on.
+class ConnectionScope {
+public:
+    ConnectionScope(std::atomic<size_t>& active, std::mutex& map_mutex,
+                    std::map<std::string, ConnectionInfo>& map,
+                    const std::string& conn_id)
+        : active_(active), map_mutex_(map_mutex), map_(map), conn_id_(conn_id) {}
+
+    ~ConnectionScope() {
+        {
+            std::lock_guard<std::mutex> lock(map_mutex_);
+            map_.erase(conn_id_);
+        }
+        active_--;
+    }
+
+    ConnectionScope(const ConnectionScope&) = delete;
+    ConnectionScope& operator=(const ConnectionScope&) = delete;
+
+private:
+    std::atomic<size_t>& active_;
+    std::mutex& map_mutex_;
+    std::map<std::string, ConnectionInfo>& map_;
+    const std::string& conn_id_;
+};
+
+} // namespace
+
 ProxyServer::ProxyServer(
     const Config& config,
     std::shared_ptr<RunwayManager> runway_manager,
@@ -27,52 +105,130 @@ ProxyServer::ProxyServer(
     , tracker_(tracker)
     , dns_resolver_(dns_resolver)
     , validator_(validator)
-    , listen_socket_(network::INVALID_SOCKET_VALUE)
     , running_(false)
     , active_connections_(0)
     , total_connections_(0)
     , total_bytes_sent_(0)
     , total_bytes_received_(0) {
+    // Precompute accepted Basic auth tokens (RFC 7617) so the per-request
+    // check is a single set lookup
+    for (const auto& pair : config_.proxy_auth_users) {
+        valid_auth_tokens_.insert(utils::base64_encode(pair.first + ":" + pair.second));
+    }
+#ifndef _WIN32
+    wake_pipe_[0] = -1;
+    wake_pipe_[1] = -1;
+#endif
+}
+
+bool ProxyServer::verify_proxy_auth(const std::map<std::string, std::string>& headers) const {
+    if (valid_auth_tokens_.empty()) {
+        return true; // Auth not configured
+    }
+
+    auto it = headers.find("proxy-authorization");
+    if (it == headers.end()) {
+        return false;
+    }
+
+    const std::string& value = it->second;
+    static const char kBasicPrefix[] = "Basic ";
+    if (value.compare(0, sizeof(kBasicPrefix) - 1, kBasicPrefix) != 0) {
+        return false;
+    }
+
+    return valid_auth_tokens_.count(utils::trim(value.substr(sizeof(kBasicPrefix) - 1))) > 0;
 }
 
 ProxyServer::~ProxyServer() {
     stop();
 }
 
+socket_t ProxyServer::open_listen_socket(bool reuse_port) {
+    socket_t sock = network::create_tcp_socket();
+    if (sock == network::INVALID_SOCKET_VALUE) {
+        return network::INVALID_SOCKET_VALUE;
+    }
+
+    // Set socket options
+    network::set_socket_option(sock, SOL_SOCKET, SO_REUSEADDR, 1);
+#if defined(SO_REUSEPORT)
+    if (reuse_port) {
+        network::set_socket_option(sock, SOL_SOCKET, SO_REUSEPORT, 1);
+    }
+#else
+    (void)reuse_port;
+#endif
+
+    // Opportunistic TFO: returning clients can put their request on the SYN.
+    // Not applied on upstream dials - the runway retry and probe paths treat
+    // connect() success as a reachability signal, and a deferred Fast Open
+    // connect would report success before the peer was ever contacted.
+    network::enable_tcp_fastopen(sock);
+
+    if (!network::bind_socket(sock, config_.proxy_listen_host, config_.proxy_listen_port) ||
+        !network::listen_socket(sock, 128)) {
+        network::close_socket(sock);
+        return network::INVALID_SOCKET_VALUE;
+    }
+
+    return sock;
+}
+
 bool ProxyServer::start() {
     if (running_) {
         return false;
     }
-    
+
     if (!network::init()) {
         return false;
     }
-    
-    listen_socket_ = network::create_tcp_socket();
-    if (listen_socket_ == network::INVALID_SOCKET_VALUE) {
-        return false;
+
+    // One accept loop per listen socket. Where SO_REUSEPORT exists, several
+    // sockets bind the same address and the kernel spreads incoming SYNs
+    // across them, so a connection burst is not serialized behind a single
+    // accept() thread. Capped: accept is cheap, connection handling owns
+    // the real work.
+#if defined(SO_REUSEPORT)
+    size_t accept_loops = std::thread::hardware_concurrency();
+    if (accept_loops > 4) {
+        accept_loops = 4;
     }
-    
-    // Set socket options
-    network::set_socket_option(listen_socket_, SOL_SOCKET, SO_REUSEADDR, 1);
-    
-    // Bind to address
-    if (!network::bind_socket(listen_socket_, config_.proxy_listen_host, config_.proxy_listen_port)) {
-        network::close_socket(listen_socket_);
-        listen_socket_ = network::INVALID_SOCKET_VALUE;
-        return false;
+    if (accept_loops == 0) {
+        accept_loops = 1;
     }
-    
-    // Listen
-    if (!network::listen_socket(listen_socket_, 128)) {
-        network::close_socket(listen_socket_);
-        listen_socket_ = network::INVALID_SOCKET_VALUE;
+#else
+    const size_t accept_loops = 1;
+#endif
+
+    for (size_t i = 0; i < accept_loops; ++i) {
+        socket_t sock = open_listen_socket(accept_loops > 1);
+        if (sock == network::INVALID_SOCKET_VALUE) {
+            // A kernel that ignores SO_REUSEPORT rejects the second bind;
+            // whatever bound so far still serves
+            break;
+        }
+        listen_sockets_.push_back(sock);
+    }
+
+    if (listen_sockets_.empty()) {
         return false;
     }
-    
+
+#ifndef _WIN32
+    // Best-effort: if the pipe cannot be created the loops fall back to
+    // waking via the socket close in stop()
+    if (pipe(wake_pipe_) != 0) {
+        wake_pipe_[0] = -1;
+        wake_pipe_[1] = -1;
+    }
+#endif
+
     running_ = true;
-    server_thread_ = std::thread(&ProxyServer::server_loop, this);
-    
+    for (socket_t sock : listen_sockets_) {
+        accept_threads_.emplace_back(&ProxyServer::server_loop, this, sock);
+    }
+
     return true;
 }
 
@@ -80,24 +236,68 @@ void ProxyServer::stop() {
     if (!running_) {
         return;
     }
-    
+
     running_ = false;
-    
-    if (listen_socket_ != network::INVALID_SOCKET_VALUE) {
-        network::close_socket(listen_socket_);
-        listen_socket_ = network::INVALID_SOCKET_VALUE;
+
+#ifndef _WIN32
+    if (wake_pipe_[1] >= 0) {
+        char wake_byte = 1;
+        ssize_t written = write(wake_pipe_[1], &wake_byte, 1);
+        (void)written; // Loops also notice running_ via the closed sockets
     }
-    
-    if (server_thread_.joinable()) {
-        server_thread_.join();
+#endif
+
+    for (socket_t sock : listen_sockets_) {
+        network::close_socket(sock);
+    }
+    listen_sockets_.clear();
+
+    for (auto& thread : accept_threads_) {
+        if (thread.joinable()) {
+            thread.join();
+        }
     }
+    accept_threads_.clear();
+
+#ifndef _WIN32
+    if (wake_pipe_[0] >= 0) close(wake_pipe_[0]);
+    if (wake_pipe_[1] >= 0) close(wake_pipe_[1]);
+    wake_pipe_[0] = -1;
+    wake_pipe_[1] = -1;
+#endif
 }
 
-void ProxyServer::server_loop() {
+void ProxyServer::server_loop(socket_t listen_sock) {
     while (running_) {
+#ifndef _WIN32
+        // Block in poll() on the listen socket and the stop() wake pipe
+        // rather than straight in accept(): no periodic timeout wakeups,
+        // and shutdown interrupts an idle listener immediately
+        struct pollfd pfds[2];
+        pfds[0].fd = listen_sock;
+        pfds[0].events = POLLIN;
+        pfds[1].fd = wake_pipe_[0]; // poll() ignores negative fds
+        pfds[1].events = POLLIN;
+        pfds[0].revents = pfds[1].revents = 0;
+
+        int ready = poll(pfds, 2, -1);
+        if (ready < 0) {
+            if (errno == EINTR) {
+                continue;
+            }
+            break;
+        }
+        if (pfds[1].revents != 0) {
+            break; // stop() wrote the wake byte
+        }
+        if ((pfds[0].revents & (POLLIN | POLLERR | POLLHUP)) == 0) {
+            continue;
+        }
+#endif
+
         std::string client_ip;
         uint16_t client_port;
-        socket_t client_sock = network::accept_connection(listen_socket_, client_ip, client_port);
+        socket_t client_sock = network::accept_connection(listen_sock, client_ip, client_port);
         
         if (client_sock == network::INVALID_SOCKET_VALUE) {
             if (running_) {
@@ -110,6 +310,19 @@ void ProxyServer::server_loop() {
             }
         }
         
+        // Bounded dispatch: past the configured ceiling, shed load with a
+        // fast 503 instead of spawning threads without limit. A connection
+        // burst then costs one canned write per excess client rather than
+        // an OS thread and its stack each; clients retry against a proxy
+        // that is still responsive instead of one buried in threads.
+        if (config_.max_concurrent_connections > 0 &&
+            active_connections_.load() >= config_.max_concurrent_connections) {
+            send_canned_response(client_sock, kServiceUnavailableResponse,
+                                 sizeof(kServiceUnavailableResponse) - 1);
+            network::close_socket(client_sock);
+            continue;
+        }
+
         // Handle connection in new thread
         std::thread([this, client_sock]() {
             handle_connection(client_sock);
@@ -118,46 +331,16 @@ void ProxyServer::server_loop() {
     }
 }
 
-bool ProxyServer::read_line(socket_t sock, std::string& line, size_t max_length) {
-    line.clear();
-    char c;
-    size_t length = 0;
-    
-    while (length < max_length) {
-        ssize_t received = network::recv_data(sock, &c, 1);
-        if (received <= 0) {
-            return false;
-        }
-        
-        if (c == '\r') {
-            // Check for \r\n
-            received = network::recv_data(sock, &c, 1);
-            if (received > 0 && c == '\n') {
-                return true; // End of line
-            }
-            if (received > 0) {
-                line += '\r';
-                line += c;
-                length += 2;
-            }
-        } else if (c == '\n') {
-            return true; // End of line
-        } else {
-            line += c;
-            length++;
-        }
-    }
-    
-    return false; // Max length exceeded
-}
-
-bool ProxyServer::read_headers(socket_t sock, std::map<std::string, std::string>& headers, size_t max_headers) {
+bool ProxyServer::read_headers(BufferedSocketReader& reader, std::map<std::string, std::string>& headers, size_t max_headers) {
     headers.clear();
     size_t header_count = 0;
-    
+
+    // One line buffer reused across headers: read_line clears and refills
+    // it, so the capacity from the longest line so far is recycled instead
+    // of a fresh allocation per header
+    std::string line;
     while (header_count < max_headers) {
-        std::string line;
-        if (!read_line(sock, line)) {
+        if (!reader.read_line(line)) {
             return false;
         }
         
@@ -165,29 +348,52 @@ bool ProxyServer::read_headers(socket_t sock, std::map<std::string, std::string>
             return true; // End of headers
         }
         
-        // Parse header line: "Name: Value"
+        // Parse header line: "Name: Value". Trim bounds are computed as
+        // indices and the name is lowercased in place, so each header costs
+        // exactly the two strings stored in the map - the old
+        // substr/trim/to_lower chain built five temporaries per header
         size_t colon_pos = line.find(':');
         if (colon_pos == std::string::npos) {
             continue; // Invalid header, skip
         }
-        
-        std::string name = utils::trim(line.substr(0, colon_pos));
-        std::string value = utils::trim(line.substr(colon_pos + 1));
-        
-        // Convert header name to lowercase (RFC 7230 Section 3.2)
-        name = utils::to_lower(name);
-        
-        headers[name] = value;
+
+        size_t name_start = line.find_first_not_of(" \t");
+        size_t name_end = colon_pos;
+        while (name_end > name_start && (line[name_end - 1] == ' ' || line[name_end - 1] == '\t')) {
+            --name_end;
+        }
+        if (name_start >= name_end) {
+            continue; // Empty header name, skip
+        }
+
+        size_t value_start = line.find_first_not_of(" \t", colon_pos + 1);
+        size_t value_end = line.size();
+        while (value_end > colon_pos + 1 &&
+               (line[value_end - 1] == ' ' || line[value_end - 1] == '\t')) {
+            --value_end;
+        }
+
+        std::string name = line.substr(name_start, name_end - name_start);
+        // Header names are case-insensitive (RFC 7230 Section 3.2)
+        for (char& c : name) {
+            c = static_cast<char>(std::tolower(static_cast<unsigned char>(c)));
+        }
+
+        if (value_start == std::string::npos || value_start >= value_end) {
+            headers[std::move(name)] = std::string();
+        } else {
+            headers[std::move(name)] = line.substr(value_start, value_end - value_start);
+        }
         header_count++;
     }
     
     return true;
 }
 
-bool ProxyServer::read_body(socket_t sock, std::vector<uint8_t>& body,
+bool ProxyServer::read_body(BufferedSocketReader& reader, std::vector<uint8_t>& body,
                             const std::map<std::string, std::string>& headers, size_t max_size) {
     body.clear();
-    
+
     // Check for Content-Length
     auto content_length_it = headers.find("content-length");
     if (content_length_it != headers.end()) {
@@ -196,103 +402,99 @@ bool ProxyServer::read_body(socket_t sock, std::vector<uint8_t>& body,
             if (content_length > max_size) {
                 return false; // Body too large
             }
-            
+
             body.resize(static_cast<size_t>(content_length));
-            size_t total_received = 0;
-            
-            while (total_received < body.size()) {
-                ssize_t received = network::recv_data(sock, 
-                    body.data() + total_received, 
-                    body.size() - total_received);
-                if (received <= 0) {
-                    return false;
-                }
-                total_received += static_cast<size_t>(received);
-            }
-            
-            return true;
+            return reader.read_exact(body.data(), body.size());
         }
     }
-    
+
     // Check for Transfer-Encoding: chunked (RFC 7230 Section 4.1)
     auto transfer_encoding_it = headers.find("transfer-encoding");
-    if (transfer_encoding_it != headers.end() && 
+    if (transfer_encoding_it != headers.end() &&
         utils::to_lower(transfer_encoding_it->second).find("chunked") != std::string::npos) {
-        
-        // Simplified chunked encoding parser
+
+        // Simplified chunked encoding parser. The size-line buffer is reused
+        // across chunks, and the hex size is parsed in place - a stringstream
+        // here would mean a heap allocation per chunk of a large body
+        std::string chunk_size_line;
         while (body.size() < max_size) {
-            std::string chunk_size_line;
-            if (!read_line(sock, chunk_size_line)) {
+            if (!reader.read_line(chunk_size_line)) {
                 return false;
             }
-            
-            // Parse chunk size (hexadecimal)
+
+            // Parse chunk size (hexadecimal); anything after it (a chunk
+            // extension, RFC 7230 Section 4.1.1) is ignored
             size_t chunk_size = 0;
-            std::istringstream iss(chunk_size_line);
-            iss >> std::hex >> chunk_size;
-            
+            for (char c : chunk_size_line) {
+                int digit;
+                if (c >= '0' && c <= '9') digit = c - '0';
+                else if (c >= 'a' && c <= 'f') digit = c - 'a' + 10;
+                else if (c >= 'A' && c <= 'F') digit = c - 'A' + 10;
+                else break;
+                chunk_size = chunk_size * 16 + static_cast<size_t>(digit);
+            }
+
             if (chunk_size == 0) {
                 // Last chunk, read trailing CRLF
-                read_line(sock, chunk_size_line);
+                reader.read_line(chunk_size_line);
                 return true;
             }
-            
+
             if (body.size() + chunk_size > max_size) {
                 return false; // Would exceed max size
             }
-            
+
             size_t old_size = body.size();
             body.resize(old_size + chunk_size);
-            
-            size_t total_received = 0;
-            while (total_received < chunk_size) {
-                ssize_t received = network::recv_data(sock,
-                    body.data() + old_size + total_received,
-                    chunk_size - total_received);
-                if (received <= 0) {
-                    return false;
-                }
-                total_received += static_cast<size_t>(received);
+            if (!reader.read_exact(body.data() + old_size, chunk_size)) {
+                return false;
             }
-            
+
             // Read chunk trailing CRLF
-            read_line(sock, chunk_size_line);
+            reader.read_line(chunk_size_line);
         }
-        
+
         return false; // Max size exceeded
     }
-    
+
     // No body
     return true;
 }
 
-bool ProxyServer::parse_http_request(socket_t sock, HTTPRequest& request) {
+bool ProxyServer::parse_http_request(BufferedSocketReader& reader, HTTPRequest& request) {
     // RFC 7230 Section 3.1.1 - Request Line
     std::string request_line;
-    if (!read_line(sock, request_line)) {
+    if (!reader.read_line(request_line)) {
         return false;
     }
     
-    // Parse: "METHOD PATH VERSION"
-    std::vector<std::string> parts = utils::split(request_line, ' ');
-    if (parts.size() < 3) {
+    // Parse: "METHOD PATH VERSION" in place. This runs once per request on
+    // the hot path; two find() calls avoid the vector of substrings that
+    // utils::split would allocate
+    size_t method_end = request_line.find(' ');
+    if (method_end == std::string::npos || method_end == 0) {
         return false;
     }
-    
-    request.method = parts[0];
-    request.path = parts[1];
-    request.version = parts[2];
+    size_t path_end = request_line.find(' ', method_end + 1);
+    if (path_end == std::string::npos || path_end == method_end + 1 ||
+        path_end + 1 >= request_line.size()) {
+        return false;
+    }
+
+    request.method = request_line.substr(0, method_end);
+    request.path = request_line.substr(method_end + 1, path_end - method_end - 1);
+    request.version = request_line.substr(path_end + 1);
     
     // Read headers
-    if (!read_headers(sock, request.headers)) {
+    if (!read_headers(reader, request.headers)) {
         return false;
     }
-    
+
     // Read body if present
-    if (!read_body(sock, request.body, request.headers)) {
+    if (!read_body(reader, request.body, request.headers)) {
         return false;
     }
-    
+
     return true;
 }
 
@@ -335,29 +537,16 @@ uint64_t ProxyServer::get_total_bytes_received() const {
     return total_bytes_received_.load();
 }
 
-std::vector<std::map<std::string, std::string>> ProxyServer::get_active_connections_info() const {
+std::vector<ConnectionInfo> ProxyServer::get_active_connections_info() const {
     std::lock_guard<std::mutex> lock(connections_mutex_);
-    std::vector<std::map<std::string, std::string>> result;
-    
-    uint64_t now = std::time(nullptr);
-    
+    std::vector<ConnectionInfo> result;
+    result.reserve(active_connections_map_.size());
+
     for (const auto& pair : active_connections_map_) {
-        std::map<std::string, std::string> conn_info = pair.second;
-        conn_info["id"] = pair.first;
-        
-        // Calculate live duration
-        if (conn_info.find("start_time") != conn_info.end()) {
-            uint64_t start_time = 0;
-            utils::safe_str_to_uint64(conn_info["start_time"], start_time);
-            if (start_time > 0) {
-                uint64_t duration = now - start_time;
-                conn_info["duration"] = std::to_string(duration);
-            }
-        }
-        
-        result.push_back(conn_info);
+        result.push_back(pair.second);
+        result.back().id = pair.first;
     }
-    
+
     return result;
 }
 
@@ -375,14 +564,20 @@ void ProxyServer::handle_connection(socket_t client_sock) {
     // Add to active connections map for live tracking
     {
         std::lock_guard<std::mutex> lock(connections_mutex_);
-        active_connections_map_[conn_id]["client_ip"] = client_ip;
-        active_connections_map_[conn_id]["client_port"] = std::to_string(client_port);
-        active_connections_map_[conn_id]["start_time"] = std::to_string(conn_start_time);
-        active_connections_map_[conn_id]["status"] = "connecting";
-        active_connections_map_[conn_id]["bytes_sent"] = "0";
-        active_connections_map_[conn_id]["bytes_received"] = "0";
+        ConnectionInfo& info = active_connections_map_[conn_id];
+        info.client_ip = client_ip;
+        info.client_port = client_port;
+        info.start_time = conn_start_time;
+        info.status = "connecting";
     }
-    
+
+    // From here on teardown is automatic: every return path below (and in
+    // handle_connect, which runs within this scope) unwinds through this
+    // guard instead of hand-written erase/decrement pairs
+    ConnectionScope conn_scope(active_connections_, connections_mutex_,
+                               active_connections_map_, conn_id);
+
+
     // Set socket timeouts to prevent hanging
     struct timeval timeout;
     timeout.tv_sec = static_cast<long>(config_.network_timeout);
@@ -395,7 +590,12 @@ void ProxyServer::handle_connection(socket_t client_sock) {
     setsockopt(client_sock, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof(timeout));
     setsockopt(client_sock, SOL_SOCKET, SO_SNDTIMEO, &timeout, sizeof(timeout));
 #endif
-    
+
+    // Disable Nagle's algorithm: proxied request/response exchanges are
+    // latency-sensitive and the 40ms delayed-ACK interaction hurts small writes.
+    // Keep-alive lets the kernel detect silently dead clients.
+    network::tune_relay_socket(client_sock);
+
     ConnectionLog conn_log;
     conn_log.timestamp = conn_start_time;
     conn_log.level = "INFO";
@@ -418,12 +618,6 @@ void ProxyServer::handle_connection(socket_t client_sock) {
         conn_log.error = "Connection closed before protocol detection";
         conn_log.duration_ms = (std::time(nullptr) - conn_start_time) * 1000.0;
         Logger::instance().log_connection(conn_log);
-        
-        {
-            std::lock_guard<std::mutex> lock(connections_mutex_);
-            active_connections_map_.erase(conn_id);
-        }
-        active_connections_--;
         return;
     }
     
@@ -437,47 +631,68 @@ void ProxyServer::handle_connection(socket_t client_sock) {
         
         {
             std::lock_guard<std::mutex> lock(connections_mutex_);
-            active_connections_map_[conn_id]["status"] = "error";
-            active_connections_map_[conn_id]["error"] = "SOCKS5 not supported";
+            ConnectionInfo& info = active_connections_map_[conn_id];
+            info.status = "error";
+            info.error = "SOCKS5 not supported";
         }
         
         // Send SOCKS5 error response (RFC 1928)
         // Version (1 byte) + Method (1 byte) = 0x05 0xFF (no acceptable methods)
         uint8_t socks5_reject[2] = {0x05, 0xFF};
         network::send_data(client_sock, reinterpret_cast<const char*>(socks5_reject), 2);
-        
-        {
-            std::lock_guard<std::mutex> lock(connections_mutex_);
-            active_connections_map_.erase(conn_id);
+        return;
+    }
+
+    // Classify everything else from the same peeked byte: SOCKS4 gets its
+    // proper rejection, and anything that cannot start an HTTP method token
+    // (TLS ClientHello 0x16, stray binary) is refused with the canned 400
+    // before the request parser does any work on it
+    if (first_byte == 0x04 || first_byte < 'A' || first_byte > 'Z') {
+        conn_log.event = "error";
+        conn_log.error = (first_byte == 0x04)
+            ? "SOCKS4 protocol not supported (HTTP proxy only)"
+            : "Not an HTTP request";
+        conn_log.duration_ms = (std::time(nullptr) - conn_start_time) * 1000.0;
+        Logger::instance().log_connection(conn_log);
+
+        if (first_byte == 0x04) {
+            // SOCKS4 reply: VN=0, CD=91 (request rejected)
+            uint8_t socks4_reject[8] = {0x00, 0x5B, 0, 0, 0, 0, 0, 0};
+            network::send_data(client_sock, reinterpret_cast<const char*>(socks4_reject), 8);
+        } else {
+            send_canned_response(client_sock, kBadRequestResponse, sizeof(kBadRequestResponse) - 1);
         }
-        active_connections_--;
         return;
     }
-    
+
     // Assume HTTP - parse request
+    // Buffered reader: pulls data in large chunks instead of one recv() per byte
+    BufferedSocketReader client_reader(client_sock);
     HTTPRequest request;
-    if (!parse_http_request(client_sock, request)) {
+    if (!parse_http_request(client_reader, request)) {
         conn_log.event = "error";
         conn_log.error = "Failed to parse HTTP request";
         conn_log.duration_ms = (std::time(nullptr) - conn_start_time) * 1000.0;
         Logger::instance().log_connection(conn_log);
-        
-        // Remove from active connections
-        {
-            std::lock_guard<std::mutex> lock(connections_mutex_);
-            active_connections_map_.erase(conn_id);
-        }
-        active_connections_--;
+
         // Send error response
-        HTTPResponse error_response;
-        error_response.status_code = 400;
-        error_response.status_text = "Bad Request";
-        error_response.headers["Content-Length"] = "0";
-        std::vector<uint8_t> response_data = build_http_response(error_response);
-        network::send_data(client_sock, response_data.data(), response_data.size());
+        send_canned_response(client_sock, kBadRequestResponse, sizeof(kBadRequestResponse) - 1);
         return;
     }
     
+    // Enforce proxy auth before doing any work on the client's behalf
+    if (!verify_proxy_auth(request.headers)) {
+        conn_log.event = "error";
+        conn_log.error = "Proxy authentication failed";
+        conn_log.status_code = 407;
+        conn_log.duration_ms = (std::time(nullptr) - conn_start_time) * 1000.0;
+        Logger::instance().log_connection(conn_log);
+
+        send_canned_response(client_sock, kProxyAuthRequiredResponse,
+                             sizeof(kProxyAuthRequiredResponse) - 1);
+        return;
+    }
+
     // Extract target from request
     std::string target_host;
     uint16_t target_port = 80;
@@ -486,40 +701,27 @@ void ProxyServer::handle_connection(socket_t client_sock) {
         // CONNECT method (RFC 7231 Section 4.3.6)
         auto host_it = request.headers.find("host");
         if (host_it == request.headers.end()) {
-            HTTPResponse error_response;
-            error_response.status_code = 400;
-            error_response.status_text = "Bad Request";
-            error_response.headers["Content-Length"] = "0";
-            std::vector<uint8_t> response_data = build_http_response(error_response);
-            network::send_data(client_sock, response_data.data(), response_data.size());
+            send_canned_response(client_sock, kBadRequestResponse, sizeof(kBadRequestResponse) - 1);
             return;
         }
         
-        std::vector<std::string> host_parts = utils::split(host_it->second, ':');
-        target_host = host_parts[0];
-        if (host_parts.size() > 1) {
-            utils::safe_str_to_uint16(host_parts[1], target_port);
-        } else {
+        if (!utils::parse_host_port(host_it->second, target_host, target_port)) {
             target_port = 443;
         }
-        
-        // CONNECT not fully implemented
-        HTTPResponse error_response;
-        error_response.status_code = 501;
-        error_response.status_text = "Not Implemented";
-        error_response.headers["Content-Length"] = "0";
-        std::vector<uint8_t> response_data = build_http_response(error_response);
-        network::send_data(client_sock, response_data.data(), response_data.size());
+
+        conn_log.target_host = target_host;
+        conn_log.target_port = target_port;
+        conn_log.method = request.method;
+        conn_log.path = request.path;
+
+        handle_connect(client_sock, client_reader, target_host, target_port,
+                       conn_log, conn_id, conn_start_time);
         return;
     } else {
         // Extract from path or Host header
         auto host_it = request.headers.find("host");
         if (host_it != request.headers.end()) {
-            std::vector<std::string> host_parts = utils::split(host_it->second, ':');
-            target_host = host_parts[0];
-            if (host_parts.size() > 1) {
-                utils::safe_str_to_uint16(host_parts[1], target_port);
-            }
+            utils::parse_host_port(host_it->second, target_host, target_port);
         } else {
             // Try to extract from path
             if (request.path.find("http://") == 0) {
@@ -542,13 +744,7 @@ void ProxyServer::handle_connection(socket_t client_sock) {
         conn_log.duration_ms = (std::time(nullptr) - conn_start_time) * 1000.0;
         Logger::instance().log_connection(conn_log);
         
-        HTTPResponse error_response;
-        error_response.status_code = 400;
-        error_response.status_text = "Bad Request";
-        error_response.headers["Content-Length"] = "0";
-        std::vector<uint8_t> response_data = build_http_response(error_response);
-        network::send_data(client_sock, response_data.data(), response_data.size());
-        active_connections_--;
+        send_canned_response(client_sock, kBadRequestResponse, sizeof(kBadRequestResponse) - 1);
         return;
     }
     
@@ -562,16 +758,17 @@ void ProxyServer::handle_connection(socket_t client_sock) {
         std::lock_guard<std::mutex> lock(connections_mutex_);
         auto it = active_connections_map_.find(conn_id);
         if (it != active_connections_map_.end()) {
-            it->second["target_host"] = target_host;
-            it->second["target_port"] = std::to_string(target_port);
-            it->second["method"] = request.method;
-            it->second["path"] = request.path;
-            it->second["status"] = "active";
+            it->second.target_host = target_host;
+            it->second.target_port = target_port;
+            it->second.method = request.method;
+            it->second.path = request.path;
+            it->second.status = "active";
         }
     }
     
-    // Select runway
-    auto all_runways = runway_manager_->get_all_runways();
+    // Select runway (shared snapshot - the list only changes at rediscovery)
+    auto runways_snapshot = runway_manager_->get_runways_snapshot();
+    const auto& all_runways = *runways_snapshot;
     auto runway = routing_engine_->select_runway(target_host, all_runways);
     
     if (!runway) {
@@ -585,13 +782,7 @@ void ProxyServer::handle_connection(socket_t client_sock) {
         conn_log.duration_ms = (std::time(nullptr) - conn_start_time) * 1000.0;
         Logger::instance().log_connection(conn_log);
         
-        HTTPResponse error_response;
-        error_response.status_code = 502;
-        error_response.status_text = "Bad Gateway";
-        error_response.headers["Content-Length"] = "0";
-        std::vector<uint8_t> response_data = build_http_response(error_response);
-        network::send_data(client_sock, response_data.data(), response_data.size());
-        active_connections_--;
+        send_canned_response(client_sock, kBadGatewayResponse, sizeof(kBadGatewayResponse) - 1);
         return;
     }
     
@@ -602,7 +793,7 @@ void ProxyServer::handle_connection(socket_t client_sock) {
         std::lock_guard<std::mutex> lock(connections_mutex_);
         auto it = active_connections_map_.find(conn_id);
         if (it != active_connections_map_.end()) {
-            it->second["runway_id"] = runway->id;
+            it->second.runway_id = runway->id;
         }
     }
     
@@ -640,10 +831,9 @@ void ProxyServer::handle_connection(socket_t client_sock) {
                 std::lock_guard<std::mutex> lock(connections_mutex_);
                 auto it = active_connections_map_.find(conn_id);
                 if (it != active_connections_map_.end()) {
-                    it->second["bytes_sent"] = std::to_string(sent);
-                    it->second["bytes_received"] = std::to_string(request.body.size());
-                    it->second["status"] = "completed";
-                    it->second["status_code"] = std::to_string(status);
+                    it->second.bytes_sent = sent;
+                    it->second.bytes_received = request.body.size();
+                    it->second.status = "completed";
                 }
             }
             
@@ -656,13 +846,6 @@ void ProxyServer::handle_connection(socket_t client_sock) {
             
             total_bytes_sent_ += sent;
             total_bytes_received_ += request.body.size();
-            
-            // Remove from active connections
-            {
-                std::lock_guard<std::mutex> lock(connections_mutex_);
-                active_connections_map_.erase(conn_id);
-            }
-            active_connections_--;
             return;
         } else if (attempt < max_retries - 1) {
             // Try alternative runway
@@ -683,8 +866,8 @@ void ProxyServer::handle_connection(socket_t client_sock) {
         std::lock_guard<std::mutex> lock(connections_mutex_);
         auto it = active_connections_map_.find(conn_id);
         if (it != active_connections_map_.end()) {
-            it->second["status"] = "error";
-            it->second["error"] = "All runway attempts failed";
+            it->second.status = "error";
+            it->second.error = "All runway attempts failed";
         }
     }
     
@@ -694,19 +877,476 @@ void ProxyServer::handle_connection(socket_t client_sock) {
     conn_log.duration_ms = duration;
     Logger::instance().log_connection(conn_log);
     
-    HTTPResponse error_response;
-    error_response.status_code = 502;
-    error_response.status_text = "Bad Gateway";
-    error_response.headers["Content-Length"] = "0";
-    std::vector<uint8_t> response_data = build_http_response(error_response);
-    network::send_data(client_sock, response_data.data(), response_data.size());
-    
-    // Remove from active connections
+    send_canned_response(client_sock, kBadGatewayResponse, sizeof(kBadGatewayResponse) - 1);
+}
+
+bool ProxyServer::establish_upstream_connect(socket_t proxy_sock,
+                                             const std::string& target_host,
+                                             uint16_t target_port, std::string& residual) {
+    // CONNECT handshake with the upstream HTTP proxy (RFC 7231 Section 4.3.6)
+    std::string connect_request;
+    connect_request.reserve(target_host.size() * 2 + 48);
+    connect_request.append("CONNECT ").append(target_host).append(1, ':')
+                   .append(std::to_string(target_port)).append(" HTTP/1.1\r\nHost: ")
+                   .append(target_host).append(1, ':')
+                   .append(std::to_string(target_port)).append("\r\n\r\n");
+
+    if (!send_all(proxy_sock, connect_request.data(), connect_request.size())) {
+        return false;
+    }
+
+    // Judge success from the status line alone - scanning the whole reply
+    // for "200" would also match digits inside header values
+    BufferedSocketReader proxy_reader(proxy_sock);
+    std::string status_line;
+    if (!proxy_reader.read_line(status_line)) {
+        return false;
+    }
+
+    // The reply must actually be an HTTP status line (RFC 7230 Section
+    // 3.1.2); anything else talking on the port - an error banner, a
+    // different protocol - must not be mistaken for a tunnel grant
+    if (status_line.compare(0, 5, "HTTP/") != 0) {
+        return false;
+    }
+
+    size_t space = status_line.find(' ');
+    if (space == std::string::npos) {
+        return false;
+    }
+    size_t code_end = status_line.find(' ', space + 1);
+    size_t code_len = (code_end == std::string::npos)
+        ? status_line.size() - (space + 1) : code_end - (space + 1);
+    if (code_len != 3 || status_line.compare(space + 1, 3, "200") != 0) {
+        return false;
+    }
+
+    // Drain the proxy's response headers; the tunnel bytes start after the
+    // blank line
+    std::string header_line;
+    do {
+        if (!proxy_reader.read_line(header_line)) {
+            return false;
+        }
+    } while (!header_line.empty());
+
+    // The reader may have pulled tunnel bytes in with the headers (a server
+    // that speaks first - SSH banner, SMTP greeting). Hand them back rather
+    // than letting them vanish with this reader.
+    if (proxy_reader.pending() > 0) {
+        residual.assign(proxy_reader.pending_data(), proxy_reader.pending());
+        proxy_reader.consume(proxy_reader.pending());
+    }
+
+    return true;
+}
+
+void ProxyServer::handle_connect(socket_t client_sock, BufferedSocketReader& client_reader,
+                                 const std::string& target_host, uint16_t target_port,
+                                 ConnectionLog& conn_log, const std::string& conn_id,
+                                 uint64_t conn_start_time) {
     {
         std::lock_guard<std::mutex> lock(connections_mutex_);
-        active_connections_map_.erase(conn_id);
+        auto it = active_connections_map_.find(conn_id);
+        if (it != active_connections_map_.end()) {
+            it->second.target_host = target_host;
+            it->second.target_port = target_port;
+            it->second.method = "CONNECT";
+            it->second.status = "active";
+        }
+    }
+
+    // Resolve target
+    std::string resolved_ip;
+    if (dns_resolver_->is_ip_address(target_host) || dns_resolver_->is_private_ip(target_host)) {
+        resolved_ip = target_host;
+    } else {
+        auto dns_result = dns_resolver_->resolve(target_host);
+        resolved_ip = dns_result.first;
     }
-    active_connections_--;
+
+    socket_t upstream_sock = network::INVALID_SOCKET_VALUE;
+    bool connected = false;
+    std::string upstream_residual; // Tunnel bytes read in with the proxy's CONNECT reply
+    if (!resolved_ip.empty()) {
+        // Route the tunnel through the selected runway: directly for direct
+        // runways, via CONNECT on the runway's HTTP upstream proxy otherwise
+        auto runway = routing_engine_->select_runway(target_host, *runway_manager_->get_runways_snapshot());
+        bool via_http_proxy = false;
+        std::string source_ip;
+        if (runway) {
+            conn_log.runway_id = runway->id;
+            if (runway->source_ip != "0.0.0.0") {
+                source_ip = runway->source_ip;
+            }
+            via_http_proxy = !runway->is_direct && runway->upstream_proxy &&
+                             (runway->upstream_proxy->config.proxy_type == "http" ||
+                              runway->upstream_proxy->config.proxy_type == "https");
+        }
+
+        if (via_http_proxy) {
+            // The proxy address may itself be a hostname; discovery caches
+            // its resolution, so only fall back to a live resolve if that
+            // failed at startup
+            std::string proxy_ip = runway->upstream_proxy->resolved_host;
+            if (proxy_ip.empty()) {
+                proxy_ip = runway->upstream_proxy->config.host;
+                if (!dns_resolver_->is_ip_address(proxy_ip)) {
+                    proxy_ip = dns_resolver_->resolve(proxy_ip).first;
+                }
+            }
+
+            // Dial through the shared pool: probes release warm keep-alive
+            // connections to the proxy, so a tunnel often skips the TCP
+            // handshake entirely and pays only the CONNECT round trip. The
+            // socket is consumed by the tunnel, so it is never released back.
+            if (!proxy_ip.empty()) {
+                bool reused = false;
+                upstream_sock = runway_manager_->get_upstream_pool()->acquire(
+                    proxy_ip, runway->upstream_proxy->config.port, source_ip,
+                    static_cast<double>(config_.network_timeout), reused);
+                if (upstream_sock != network::INVALID_SOCKET_VALUE) {
+                    connected = establish_upstream_connect(upstream_sock, target_host,
+                                                           target_port, upstream_residual);
+                }
+            }
+        } else {
+            upstream_sock = network::create_tcp_socket();
+            if (upstream_sock != network::INVALID_SOCKET_VALUE) {
+                // Prefer a device bind, which pins routing to the runway's
+                // interface; fall back to the address bind when unavailable
+                // (non-Linux, or missing CAP_NET_RAW)
+                bool bound = runway && network::bind_to_device(upstream_sock, runway->interface_name);
+                if (!bound && !source_ip.empty()) {
+                    network::bind_socket(upstream_sock, source_ip, 0);
+                }
+                network::tune_relay_socket(upstream_sock);
+                connected = network::connect_with_timeout(upstream_sock, resolved_ip, target_port,
+                                                          static_cast<double>(config_.network_timeout));
+            }
+        }
+    }
+
+    if (!connected) {
+        if (upstream_sock != network::INVALID_SOCKET_VALUE) {
+            network::close_socket(upstream_sock);
+        }
+
+        conn_log.event = "error";
+        conn_log.error = "Tunnel connection failed";
+        conn_log.status_code = 502;
+        conn_log.duration_ms = (std::time(nullptr) - conn_start_time) * 1000.0;
+        Logger::instance().log_connection(conn_log);
+
+        send_canned_response(client_sock, kBadGatewayResponse, sizeof(kBadGatewayResponse) - 1);
+        return;
+    }
+
+    // Tell the client the tunnel is up (RFC 7231 Section 4.3.6)
+    if (!send_all(client_sock, kConnectionEstablished, sizeof(kConnectionEstablished) - 1)) {
+        network::close_socket(upstream_sock);
+        return;
+    }
+
+    // Forward anything the client pipelined behind the CONNECT request
+    // (e.g. an eager TLS ClientHello) before handing off to the relay
+    if (client_reader.pending() > 0) {
+        send_all(upstream_sock, client_reader.pending_data(), client_reader.pending());
+        client_reader.consume(client_reader.pending());
+    }
+
+    // And the mirror image: tunnel bytes the upstream handshake reader
+    // swallowed along with the proxy's reply headers
+    if (!upstream_residual.empty()) {
+        send_all(client_sock, upstream_residual.data(), upstream_residual.size());
+    }
+
+    uint64_t bytes_client_to_upstream = 0;
+    uint64_t bytes_upstream_to_client = 0;
+    relay_traffic(client_sock, upstream_sock, bytes_client_to_upstream, bytes_upstream_to_client);
+
+    network::close_socket(upstream_sock);
+
+    total_bytes_sent_ += bytes_upstream_to_client;
+    total_bytes_received_ += bytes_client_to_upstream;
+
+    conn_log.event = "disconnect";
+    conn_log.status_code = 200;
+    conn_log.bytes_sent = bytes_upstream_to_client;
+    conn_log.bytes_received = bytes_client_to_upstream;
+    conn_log.duration_ms = (std::time(nullptr) - conn_start_time) * 1000.0;
+    Logger::instance().log_connection(conn_log);
+}
+
+void ProxyServer::relay_traffic(socket_t client_sock, socket_t upstream_sock,
+                                uint64_t& bytes_client_to_upstream,
+                                uint64_t& bytes_upstream_to_client) {
+    int timeout_ms = static_cast<int>(config_.network_timeout) * 1000;
+
+    // Each direction is torn down independently: an EOF on one side is
+    // propagated immediately as a FIN to the other (shutdown(SHUT_WR)) while
+    // the opposite direction keeps relaying. Errors and timeouts still drop
+    // the whole tunnel at once.
+    bool dir_open[2] = {true, true};
+
+#ifdef _WIN32
+    // Windows: select-based copy loop. The buffer is sized once per tunnel
+    // and left uninitialized - recv overwrites it, so a vector's zero-fill
+    // would be 128 KiB of wasted writes per connection
+    const size_t kRelayBufferSize = 131072;
+    std::unique_ptr<char[]> buffer(new char[kRelayBufferSize]);
+    bool error = false;
+
+    while (!error && (dir_open[0] || dir_open[1])) {
+        fd_set readfds;
+        FD_ZERO(&readfds);
+        if (dir_open[0]) FD_SET(client_sock, &readfds);
+        if (dir_open[1]) FD_SET(upstream_sock, &readfds);
+
+        struct timeval timeout;
+        timeout.tv_sec = timeout_ms / 1000;
+        timeout.tv_usec = (timeout_ms % 1000) * 1000;
+
+        int ready = select(0, &readfds, nullptr, nullptr, &timeout);
+        if (ready <= 0) {
+            break; // Timeout or error - tear the tunnel down
+        }
+
+        for (int i = 0; i < 2 && !error; ++i) {
+            socket_t src = (i == 0) ? client_sock : upstream_sock;
+            socket_t dst = (i == 0) ? upstream_sock : client_sock;
+            uint64_t& counter = (i == 0) ? bytes_client_to_upstream : bytes_upstream_to_client;
+
+            if (!dir_open[i] || !FD_ISSET(src, &readfds)) continue;
+
+            int received = recv(src, buffer.get(), static_cast<int>(kRelayBufferSize), 0);
+            if (received == 0) {
+                shutdown(dst, SD_SEND);
+                dir_open[i] = false;
+                continue;
+            }
+            if (received < 0 || !send_all(dst, buffer.get(), static_cast<size_t>(received))) {
+                error = true;
+                break;
+            }
+            counter += static_cast<uint64_t>(received);
+        }
+    }
+#else
+    struct pollfd fds[2];
+    fds[0].fd = client_sock;
+    fds[0].events = POLLIN;
+    fds[1].fd = upstream_sock;
+    fds[1].events = POLLIN;
+
+#ifdef __linux__
+    // Zero-copy path: splice() moves bytes between the sockets through a
+    // kernel pipe, skipping the copy into and back out of userspace that a
+    // recv()/send() loop pays for every chunk
+    int pipes[2][2] = {{-1, -1}, {-1, -1}};
+    bool use_splice = (pipe2(pipes[0], O_CLOEXEC | O_NONBLOCK) == 0 &&
+                       pipe2(pipes[1], O_CLOEXEC | O_NONBLOCK) == 0);
+    if (!use_splice) {
+        for (int d = 0; d < 2; ++d) {
+            if (pipes[d][0] >= 0) close(pipes[d][0]);
+            if (pipes[d][1] >= 0) close(pipes[d][1]);
+        }
+    } else {
+#ifdef F_SETPIPE_SZ
+        // Default pipes hold 64 KiB; on fast paths that caps how much one
+        // splice round can move and forces extra wakeups. Ask for 1 MiB -
+        // best-effort, since unprivileged processes are clamped to
+        // /proc/sys/fs/pipe-max-size and the default works regardless
+        for (int d = 0; d < 2; ++d) {
+            fcntl(pipes[d][0], F_SETPIPE_SZ, 1 << 20);
+        }
+#endif
+    }
+#else
+    const bool use_splice = false;
+#endif
+
+    // Fallback path flow control: sockets go non-blocking, and a partial
+    // send parks the unsent tail in a per-direction backlog. While a backlog
+    // exists we stop reading from that direction's source and instead poll
+    // its destination for POLLOUT - the slow peer throttles the fast one
+    // instead of the relay thread blocking inside send()
+    // Per-direction buffers sized once per tunnel and reused for every
+    // chunk; left uninitialized since recv overwrites before any read.
+    // 128 KiB halves the recv/send syscalls per MB versus 64 KiB on bulk
+    // flows; the kernel caps each call at whatever the buffers hold anyway
+    const size_t kRelayBufferSize = 131072;
+    std::unique_ptr<char[]> buffers[2];
+    size_t pending_off[2] = {0, 0};
+    size_t pending_len[2] = {0, 0};
+    if (!use_splice) {
+        buffers[0].reset(new char[kRelayBufferSize]);
+        buffers[1].reset(new char[kRelayBufferSize]);
+        network::set_nonblocking(client_sock);
+        network::set_nonblocking(upstream_sock);
+    }
+
+    socket_t socks[2] = {client_sock, upstream_sock};
+
+    // Each poll() wakeup drains up to this many read rounds per direction
+    // before re-polling. One round per wakeup means one poll() syscall per
+    // buffer of data moved; batching amortizes that across bursts while the
+    // cap keeps a fast direction from starving the other one
+    const int kMaxRoundsPerWakeup = 8;
+
+    bool error = false;
+    while (!error && (dir_open[0] || dir_open[1])) {
+        // poll() ignores negative fds, so a socket with nothing to wait for
+        // simply drops out of the watch set
+        for (int j = 0; j < 2; ++j) {
+            short events = 0;
+            if (dir_open[j] && pending_len[j] == 0) {
+                events |= POLLIN;
+            }
+            if (pending_len[1 - j] > 0) {
+                events |= POLLOUT; // Backlog destined for this socket
+            }
+            fds[j].fd = (events != 0) ? socks[j] : -1;
+            fds[j].events = events;
+            fds[j].revents = 0;
+        }
+
+        int ready = poll(fds, 2, timeout_ms);
+        if (ready <= 0) {
+            break; // Timeout or error - tear the tunnel down
+        }
+
+        for (int i = 0; i < 2 && !error; ++i) {
+            socket_t src = socks[i];
+            socket_t dst = socks[1 - i];
+            uint64_t& counter = (i == 0) ? bytes_client_to_upstream : bytes_upstream_to_client;
+
+            // Drain this direction's backlog once its destination is writable
+            if (pending_len[i] > 0 && (fds[1 - i].revents & (POLLOUT | POLLHUP | POLLERR))) {
+                while (pending_len[i] > 0) {
+                    ssize_t sent = send(dst, buffers[i].get() + pending_off[i],
+                                        pending_len[i], 0);
+                    if (sent > 0) {
+                        pending_off[i] += static_cast<size_t>(sent);
+                        pending_len[i] -= static_cast<size_t>(sent);
+                        counter += static_cast<uint64_t>(sent);
+                        continue;
+                    }
+                    if (sent < 0 && (errno == EAGAIN || errno == EWOULDBLOCK)) {
+                        break; // Still full - keep waiting for POLLOUT
+                    }
+                    error = true;
+                    break;
+                }
+            }
+
+            if (error || !dir_open[i] || pending_len[i] > 0) continue;
+            if (!(fds[i].revents & (POLLIN | POLLHUP | POLLERR))) continue;
+
+#ifdef __linux__
+            if (use_splice) {
+                for (int round = 0; round < kMaxRoundsPerWakeup && !error; ++round) {
+                    // Ask for up to the full pipe capacity per call; splice
+                    // moves whatever is actually available, so a generous
+                    // length just lets bursts ride in fewer syscalls
+                    ssize_t moved = splice(src, nullptr, pipes[i][1], nullptr, 1 << 20,
+                                           SPLICE_F_MOVE | SPLICE_F_NONBLOCK);
+                    if (moved == 0) {
+                        shutdown(dst, SHUT_WR);
+                        dir_open[i] = false;
+                        break;
+                    }
+                    if (moved < 0) {
+                        if (errno == EAGAIN || errno == EWOULDBLOCK) {
+                            break; // Source drained or full pipe - re-poll
+                        }
+                        if (errno == EINVAL || errno == ENOSYS) {
+                            // Kernel refuses splice on this socket pair (e.g. an
+                            // exotic socket type). The pipe is empty at this point,
+                            // so switch to the recv/send fallback mid-tunnel
+                            // instead of dropping the connection
+                            for (int d = 0; d < 2; ++d) {
+                                close(pipes[d][0]);
+                                close(pipes[d][1]);
+                            }
+                            use_splice = false;
+                            buffers[0].reset(new char[kRelayBufferSize]);
+                            buffers[1].reset(new char[kRelayBufferSize]);
+                            network::set_nonblocking(client_sock);
+                            network::set_nonblocking(upstream_sock);
+                            break;
+                        }
+                        error = true;
+                        break;
+                    }
+
+                    ssize_t remaining = moved;
+                    while (remaining > 0) {
+                        ssize_t sent = splice(pipes[i][0], nullptr, dst, nullptr,
+                                              static_cast<size_t>(remaining), SPLICE_F_MOVE);
+                        if (sent <= 0) {
+                            error = true;
+                            break;
+                        }
+                        remaining -= sent;
+                    }
+                    if (!error) {
+                        counter += static_cast<uint64_t>(moved);
+                    }
+                }
+                continue;
+            }
+#endif
+
+            for (int round = 0; round < kMaxRoundsPerWakeup && !error; ++round) {
+                ssize_t received = recv(src, buffers[i].get(), kRelayBufferSize, 0);
+                if (received == 0) {
+                    shutdown(dst, SHUT_WR);
+                    dir_open[i] = false;
+                    break;
+                }
+                if (received < 0) {
+                    if (errno != EAGAIN && errno != EWOULDBLOCK) {
+                        error = true;
+                    }
+                    break; // Source drained - re-poll
+                }
+
+                // Forward immediately; whatever does not fit in the destination's
+                // send buffer becomes this direction's backlog and pauses reads
+                size_t off = 0;
+                while (off < static_cast<size_t>(received)) {
+                    ssize_t sent = send(dst, buffers[i].get() + off,
+                                        static_cast<size_t>(received) - off, 0);
+                    if (sent > 0) {
+                        off += static_cast<size_t>(sent);
+                        counter += static_cast<uint64_t>(sent);
+                        continue;
+                    }
+                    if (sent < 0 && (errno == EAGAIN || errno == EWOULDBLOCK)) {
+                        pending_off[i] = off;
+                        pending_len[i] = static_cast<size_t>(received) - off;
+                        break;
+                    }
+                    error = true;
+                    break;
+                }
+                if (pending_len[i] > 0) {
+                    break; // Destination full - wait for POLLOUT before reading more
+                }
+            }
+        }
+    }
+
+#ifdef __linux__
+    if (use_splice) {
+        for (int d = 0; d < 2; ++d) {
+            close(pipes[d][0]);
+            close(pipes[d][1]);
+        }
+    }
+#endif
+#endif // _WIN32
 }
 
 std::tuple<bool, bool, uint16_t, std::map<std::string, std::string>, std::vector<uint8_t>>
@@ -746,8 +1386,15 @@ ProxyServer::make_http_request(const HTTPRequest& request, const std::string& ta
     setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof(timeout));
     setsockopt(sock, SOL_SOCKET, SO_SNDTIMEO, &timeout, sizeof(timeout));
 #endif
-    
-    bool connected = network::connect_socket(sock, resolved_ip, target_port);
+
+    // Same tuning as the client side: no Nagle delay, keep-alive on
+    network::tune_relay_socket(sock);
+
+    // Bounded connect: SO_SNDTIMEO does not apply to connect() itself, so
+    // the plain blocking call could stall a worker thread for the kernel's
+    // full SYN retry cycle on an unreachable target
+    bool connected = network::connect_with_timeout(sock, resolved_ip, target_port,
+                                                   static_cast<double>(config_.network_timeout));
     if (!connected) {
         network::close_socket(sock);
         return std::make_tuple(false, false, static_cast<uint16_t>(502),
@@ -755,34 +1402,54 @@ ProxyServer::make_http_request(const HTTPRequest& request, const std::string& ta
                               std::vector<uint8_t>());
     }
     
-    // Build request
-    std::ostringstream request_oss;
-    request_oss << request.method << " " << request.path << " " << request.version << "\r\n";
-    
-    // Copy headers (remove hop-by-hop headers, RFC 7230 Section 6.1)
+    // Build request by appending into one preallocated string: ostringstream
+    // grows through its streambuf and allocates per insertion, which adds up
+    // on a path that runs once per forwarded request
+    std::string request_str;
+    size_t estimated = request.method.size() + request.path.size() +
+                       request.version.size() + target_host.size() +
+                       request.body.size() + 64;
+    for (const auto& pair : request.headers) {
+        estimated += pair.first.size() + pair.second.size() + 4;
+    }
+    request_str.reserve(estimated);
+
+    request_str.append(request.method).append(1, ' ')
+               .append(request.path).append(1, ' ')
+               .append(request.version).append("\r\n");
+
+    // Copy headers (remove hop-by-hop headers, RFC 7230 Section 6.1);
+    // header names are already lowercased by read_headers
     for (const auto& pair : request.headers) {
-        std::string name = utils::to_lower(pair.first);
-        if (name != "host" && name != "connection" && name != "proxy-connection") {
-            request_oss << pair.first << ": " << pair.second << "\r\n";
+        const std::string& name = pair.first;
+        if (name != "host" && name != "connection" && name != "proxy-connection" &&
+            name != "proxy-authorization") {
+            request_str.append(name).append(": ").append(pair.second).append("\r\n");
         }
     }
-    request_oss << "Host: " << target_host;
+    request_str.append("Host: ").append(target_host);
     if (target_port != 80 && target_port != 443) {
-        request_oss << ":" << target_port;
+        request_str.append(1, ':').append(std::to_string(target_port));
     }
-    request_oss << "\r\n";
-    request_oss << "\r\n";
-    
-    std::string request_str = request_oss.str();
-    network::send_data(sock, request_str.data(), request_str.size());
-    
+    request_str.append("\r\n\r\n");
+
+    // Coalesce headers and body into a single send: two separate sends put
+    // the headers and a small body in separate segments, costing an extra
+    // syscall and (with Nagle off) an extra packet per request
     if (!request.body.empty()) {
-        network::send_data(sock, request.body.data(), request.body.size());
+        request_str.append(reinterpret_cast<const char*>(request.body.data()), request.body.size());
+    }
+    if (!send_all(sock, request_str.data(), request_str.size())) {
+        network::close_socket(sock);
+        return std::make_tuple(false, false, static_cast<uint16_t>(502),
+                              std::map<std::string, std::string>(),
+                              std::vector<uint8_t>());
     }
     
     // Read response
+    BufferedSocketReader response_reader(sock);
     std::string status_line;
-    if (!read_line(sock, status_line)) {
+    if (!response_reader.read_line(status_line)) {
         network::close_socket(sock);
         return std::make_tuple(false, false, static_cast<uint16_t>(502),
                               std::map<std::string, std::string>(),
@@ -808,7 +1475,7 @@ ProxyServer::make_http_request(const HTTPRequest& request, const std::string& ta
     
     // Read headers
     std::map<std::string, std::string> response_headers;
-    if (!read_headers(sock, response_headers)) {
+    if (!read_headers(response_reader, response_headers)) {
         network::close_socket(sock);
         return std::make_tuple(false, false, static_cast<uint16_t>(502),
                               std::map<std::string, std::string>(),
@@ -817,7 +1484,7 @@ ProxyServer::make_http_request(const HTTPRequest& request, const std::string& ta
     
     // Read body
     std::vector<uint8_t> response_body;
-    if (!read_body(sock, response_body, response_headers)) {
+    if (!read_body(response_reader, response_body, response_headers)) {
         network::close_socket(sock);
         return std::make_tuple(false, false, static_cast<uint16_t>(502),
                               std::map<std::string, std::string>(),
@@ -841,7 +1508,41 @@ ProxyServer::make_http_request(const HTTPRequest& request, const std::string& ta
 std::shared_ptr<Runway> ProxyServer::test_all_runways(
     const std::string& target,
     const std::vector<std::shared_ptr<Runway>>& runways) {
-    
+
+    // Single-flight per target: when several connections hit the same new
+    // host at once, only the first runs the probe race. The rest wait here
+    // and then pick from the tracker data that race just produced - probing
+    // the same target N times in parallel would multiply the probe load for
+    // the same answer
+    const uint64_t kRaceCooldownSecs = 5;
+    uint64_t now = static_cast<uint64_t>(std::chrono::duration_cast<std::chrono::seconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count());
+
+    {
+        std::unique_lock<std::mutex> lock(race_mutex_);
+        if (races_inflight_.count(target) > 0) {
+            race_cv_.wait(lock, [this, &target]() {
+                return races_inflight_.count(target) == 0;
+            });
+            lock.unlock();
+            return routing_engine_->select_runway(target, runways);
+        }
+
+        // We only get here when selection found nothing, so if a race
+        // finished moments ago its verdict was "inaccessible" - repeating
+        // it per connection would probe-storm a dead target. Answer from
+        // the tracker until the cooldown lapses (the health monitor keeps
+        // re-probing on its own schedule regardless).
+        auto finished_it = race_finished_at_.find(target);
+        if (finished_it != race_finished_at_.end() &&
+            now - finished_it->second < kRaceCooldownSecs) {
+            lock.unlock();
+            return routing_engine_->select_runway(target, runways);
+        }
+
+        races_inflight_.insert(target);
+    }
+
     // Prioritize direct runways
     std::vector<std::shared_ptr<Runway>> direct_runways;
     std::vector<std::shared_ptr<Runway>> proxy_runways;
@@ -857,21 +1558,108 @@ std::shared_ptr<Runway> ProxyServer::test_all_runways(
     std::vector<std::shared_ptr<Runway>> prioritized;
     prioritized.insert(prioritized.end(), direct_runways.begin(), direct_runways.end());
     prioritized.insert(prioritized.end(), proxy_runways.begin(), proxy_runways.end());
-    
-    // Test runways
-    for (const auto& runway : prioritized) {
-        auto result = runway_manager_->test_runway_accessibility(target, runway, static_cast<double>(config_.accessibility_timeout));
-        bool net_success = std::get<0>(result);
-        bool user_success = std::get<1>(result);
-        double response_time = std::get<2>(result);
-        
-        tracker_->update(target, runway->id, net_success, user_success, response_time);
-        
-        if (user_success) {
-            return runway;
+
+    // Resolve once for the whole race: every runway probes the same target,
+    // so per-probe resolution would just repeat the same cache lookup
+    std::string resolved_ip = runway_manager_->resolve_target(target);
+    if (resolved_ip.empty()) {
+        // Resolution failure fails every runway equally; record it so the
+        // tracker sees these attempts, as it would have per probe
+        for (const auto& runway : prioritized) {
+            tracker_->update(target, runway->id, false, false, 0.0);
+        }
+        {
+            std::lock_guard<std::mutex> lock(race_mutex_);
+            races_inflight_.erase(target);
+            race_finished_at_[target] = now;
         }
+        race_cv_.notify_all();
+        return nullptr;
+    }
+
+    // Race runways over a fixed set of workers pulling indices from a shared
+    // counter: serial probing pays the sum of the timeouts when early
+    // runways are dead, racing pays roughly the max. The old batch-of-3
+    // spawn/join created one thread per runway and stalled on each batch's
+    // slowest probe; three persistent workers cost three thread starts total
+    // and stop pulling as soon as a winner is known. Every completed probe
+    // still feeds the tracker so nothing is wasted.
+    const size_t kRaceWidth = 3;
+    // Happy Eyeballs-style stagger (RFC 8305): worker N starts N delays
+    // after worker 0, so when the preferred runway answers promptly - the
+    // common case - the redundant probes never fire at all. A win wakes
+    // the still-waiting workers early so losers don't sleep out the delay.
+    const int kStaggerDelayMs = 100;
+    std::atomic<size_t> next_idx(0);
+    std::mutex winner_mutex;
+    std::condition_variable winner_cv;
+    size_t winner_idx = prioritized.size(); // Sentinel: no winner yet
+
+    size_t worker_count = std::min(kRaceWidth, prioritized.size());
+    std::vector<std::thread> probes;
+
+    for (size_t t = 0; t < worker_count; ++t) {
+        probes.emplace_back([this, t, kStaggerDelayMs, &target, &prioritized, &resolved_ip,
+                             &next_idx, &winner_mutex, &winner_cv, &winner_idx]() {
+            if (t > 0) {
+                std::unique_lock<std::mutex> lock(winner_mutex);
+                winner_cv.wait_for(lock, std::chrono::milliseconds(kStaggerDelayMs) * t,
+                                   [&]() { return winner_idx < prioritized.size(); });
+            }
+
+            while (true) {
+                size_t idx = next_idx.fetch_add(1);
+                if (idx >= prioritized.size()) {
+                    break;
+                }
+
+                {
+                    std::lock_guard<std::mutex> lock(winner_mutex);
+                    // A higher-priority runway already won; probing lower
+                    // priorities can no longer change the outcome
+                    if (winner_idx < idx) {
+                        break;
+                    }
+                }
+
+                auto runway = prioritized[idx];
+                auto result = runway_manager_->test_runway_accessibility_resolved(
+                    resolved_ip, runway, static_cast<double>(config_.accessibility_timeout));
+                bool net_success = std::get<0>(result);
+                bool user_success = std::get<1>(result);
+                double response_time = std::get<2>(result);
+
+                tracker_->update(target, runway->id, net_success, user_success, response_time);
+
+                if (user_success) {
+                    {
+                        std::lock_guard<std::mutex> lock(winner_mutex);
+                        // Keep the highest-priority success so racing does
+                        // not reorder direct-before-proxy preference
+                        winner_idx = std::min(winner_idx, idx);
+                    }
+                    winner_cv.notify_all();
+                }
+            }
+        });
+    }
+
+    for (auto& probe : probes) {
+        probe.join();
+    }
+
+    {
+        std::lock_guard<std::mutex> lock(race_mutex_);
+        races_inflight_.erase(target);
+        race_finished_at_[target] = static_cast<uint64_t>(
+            std::chrono::duration_cast<std::chrono::seconds>(
+                std::chrono::steady_clock::now().time_since_epoch()).count());
+    }
+    race_cv_.notify_all();
+
+    if (winner_idx < prioritized.size()) {
+        return prioritized[winner_idx];
     }
-    
     return nullptr;
 }
 
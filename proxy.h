@@ -8,6 +8,10 @@
 #include <thread>
 #include <atomic>
 #include <cstdint>
+#include <mutex>
+#include <condition_variable>
+#include <set>
+#include <unordered_set>
 #include "config.h"
 #include "runway.h"
 #include "runway_manager.h"
@@ -16,6 +20,8 @@
 #include "dns.h"
 #include "validator.h"
 #include "network.h"
+#include "buffered_reader.h"
+#include "logger.h"
 
 // HTTP Proxy Server
 // RFC 7230 - HTTP/1.1 Message Syntax and Routing
@@ -37,10 +43,37 @@ struct HTTPResponse {
     std::string status_text;
     std::map<std::string, std::string> headers;
     std::vector<uint8_t> body;
-    
+
     HTTPResponse() : version("HTTP/1.1"), status_code(200), status_text("OK") {}
 };
 
+// Live state of one proxied connection (displayed by the TUI/WebUI).
+// Typed fields: the previous map<string,string> representation cost a
+// handful of string allocations and number-to-string conversions per
+// update on every connection
+struct ConnectionInfo {
+    std::string id;
+    std::string client_ip;
+    uint16_t client_port;
+    std::string target_host;
+    uint16_t target_port;
+    std::string runway_id;
+    std::string method;
+    std::string path;
+    uint64_t start_time;
+    uint64_t bytes_sent;
+    uint64_t bytes_received;
+    std::string status; // "connecting", "active", "completed", "error"
+    std::string error;
+
+    ConnectionInfo()
+        : client_port(0)
+        , target_port(0)
+        , start_time(0)
+        , bytes_sent(0)
+        , bytes_received(0) {}
+};
+
 class ProxyServer {
 public:
     ProxyServer(const Config& config,
@@ -68,7 +101,7 @@ public:
     uint64_t get_total_bytes_received() const;
     
     // Get active connections list (for TUI)
-    std::vector<std::map<std::string, std::string>> get_active_connections_info() const;
+    std::vector<ConnectionInfo> get_active_connections_info() const;
     
 private:
     Config config_;
@@ -78,10 +111,23 @@ private:
     std::shared_ptr<DNSResolver> dns_resolver_;
     std::shared_ptr<SuccessValidator> validator_;
     
-    socket_t listen_socket_;
+    // Listen sockets and their accept loops. On Linux several sockets bind
+    // the same address with SO_REUSEPORT and the kernel hash-distributes
+    // incoming SYNs across them, so accepts scale past one thread; elsewhere
+    // there is exactly one socket and one loop.
+    std::vector<socket_t> listen_sockets_;
+    std::vector<std::thread> accept_threads_;
     std::atomic<bool> running_;
-    std::thread server_thread_;
-    
+
+#ifndef _WIN32
+    // Self-pipe waking the accept loops on stop() (same pattern as the
+    // TUI's input loop): POSIX does not guarantee that closing a listen
+    // socket wakes a thread already blocked in accept(), so without this
+    // an idle listener could stall shutdown indefinitely. On Windows
+    // closesocket() aborts a blocked accept, so no pipe is needed.
+    int wake_pipe_[2];
+#endif
+
     // Connection tracking
     mutable std::mutex stats_mutex_;
     mutable std::mutex connections_mutex_;
@@ -91,20 +137,65 @@ private:
     std::atomic<uint64_t> total_bytes_received_;
     
     // Active connections map: conn_id -> connection info
-    std::map<std::string, std::map<std::string, std::string>> active_connections_map_;
+    std::map<std::string, ConnectionInfo> active_connections_map_;
+
+    // Valid "Proxy-Authorization: Basic <token>" tokens, precomputed from
+    // config at construction so auth is one hash lookup per request instead
+    // of decoding credentials every time. Empty set = auth disabled.
+    std::unordered_set<std::string> valid_auth_tokens_;
+
+    // Probe races in flight, keyed by target (single-flight, mirroring
+    // DNSResolver's inflight_ set). A burst of connections to the same new
+    // host must not each spawn a full probe race: the first claims the
+    // target, the rest wait and read the winner out of the tracker.
+    std::mutex race_mutex_;
+    std::condition_variable race_cv_;
+    std::set<std::string> races_inflight_;
+
+    // Monotonic seconds at which the last probe race for a target finished.
+    // A race that just completed already answered the question, so within a
+    // short cooldown new connections read the tracker instead of re-racing -
+    // otherwise an inaccessible target turns every connection into a fresh
+    // full probe sweep.
+    std::map<std::string, uint64_t> race_finished_at_;
+
+    // Check Proxy-Authorization header against the precomputed token set
+    bool verify_proxy_auth(const std::map<std::string, std::string>& headers) const;
     
-    // Server main loop
-    void server_loop();
+    // Accept loop for one listen socket
+    void server_loop(socket_t listen_sock);
+
+    // Create, tune, bind and listen one server socket; INVALID_SOCKET_VALUE
+    // on failure. reuse_port additionally sets SO_REUSEPORT where available.
+    socket_t open_listen_socket(bool reuse_port);
     
     // Handle client connection
     void handle_connection(socket_t client_sock);
     
     // Parse HTTP request (RFC 7230 Section 3)
-    bool parse_http_request(socket_t sock, HTTPRequest& request);
+    bool parse_http_request(BufferedSocketReader& reader, HTTPRequest& request);
     
     // Build HTTP response (RFC 7230 Section 3)
     std::vector<uint8_t> build_http_response(const HTTPResponse& response);
     
+    // Handle CONNECT tunnel (RFC 7231 Section 4.3.6)
+    void handle_connect(socket_t client_sock, BufferedSocketReader& client_reader,
+                        const std::string& target_host, uint16_t target_port,
+                        ConnectionLog& conn_log, const std::string& conn_id,
+                        uint64_t conn_start_time);
+
+    // CONNECT handshake with an upstream HTTP proxy; true once the proxy
+    // reports 200 and its response headers are drained. Bytes the handshake
+    // reader pulled in past the blank line are the server's first flight
+    // through the tunnel; they land in residual and must reach the client
+    // before the relay takes over, or they are lost.
+    bool establish_upstream_connect(socket_t proxy_sock, const std::string& target_host,
+                                    uint16_t target_port, std::string& residual);
+
+    // Relay bytes in both directions until either side closes
+    void relay_traffic(socket_t client_sock, socket_t upstream_sock,
+                       uint64_t& bytes_client_to_upstream, uint64_t& bytes_upstream_to_client);
+
     // Make HTTP request through runway
     std::tuple<bool, bool, uint16_t, std::map<std::string, std::string>, std::vector<uint8_t>>
     make_http_request(const HTTPRequest& request, const std::string& target_host,
@@ -118,14 +209,11 @@ private:
     std::shared_ptr<Runway> get_alternative_runway(const std::string& target,
                                                     const std::string& current_runway_id);
     
-    // Read line from socket (defensive: prevent buffer overflow)
-    bool read_line(socket_t sock, std::string& line, size_t max_length = 8192);
-    
     // Read HTTP headers
-    bool read_headers(socket_t sock, std::map<std::string, std::string>& headers, size_t max_headers = 100);
-    
+    bool read_headers(BufferedSocketReader& reader, std::map<std::string, std::string>& headers, size_t max_headers = 100);
+
     // Read HTTP body (Content-Length or chunked)
-    bool read_body(socket_t sock, std::vector<uint8_t>& body, 
+    bool read_body(BufferedSocketReader& reader, std::vector<uint8_t>& body,
                    const std::map<std::string, std::string>& headers, size_t max_size = 10 * 1024 * 1024);
 };
 
@@ -1,8 +1,9 @@
 #include "routing.h"
 #include <algorithm>
+#include <unordered_set>
 
 RoutingEngine::RoutingEngine(std::shared_ptr<TargetAccessibilityTracker> tracker, RoutingMode mode)
-    : tracker_(tracker), mode_(mode) {
+    : tracker_(tracker), mode_(mode), round_robin_counter_(0) {
 }
 
 void RoutingEngine::set_mode(RoutingMode mode) {
@@ -21,17 +22,35 @@ std::shared_ptr<Runway> RoutingEngine::select_runway(
     
     std::lock_guard<std::mutex> lock(mode_mutex_);
     RoutingMode current_mode = mode_;
-    
+
+    // Latency fast path: the tracker precomputes the lowest-latency
+    // accessible runway at probe time, so the common case is one cached
+    // read plus an id match - no candidate set or filtered vector at all.
+    // An empty or stale answer falls through to the generic path below.
+    if (current_mode == RoutingMode::Latency) {
+        std::string best_id = tracker_->get_best_runway(target);
+        if (!best_id.empty()) {
+            for (const auto& runway : runways) {
+                if (runway->id == best_id) {
+                    return runway;
+                }
+            }
+        }
+    }
+
     // Get accessible runways
     std::vector<std::string> accessible_ids = tracker_->get_accessible_runways(target);
     if (accessible_ids.empty()) {
         return nullptr;
     }
-    
-    // Filter runways to only accessible ones
+
+    // Filter runways to only accessible ones. Hash-set membership instead
+    // of a linear std::find per runway: the old filter was O(runways x
+    // accessible) on every request
+    std::unordered_set<std::string> accessible_set(accessible_ids.begin(), accessible_ids.end());
     std::vector<std::shared_ptr<Runway>> accessible_runways;
     for (const auto& runway : runways) {
-        if (std::find(accessible_ids.begin(), accessible_ids.end(), runway->id) != accessible_ids.end()) {
+        if (accessible_set.count(runway->id) > 0) {
             accessible_runways.push_back(runway);
         }
     }
@@ -56,23 +75,17 @@ std::shared_ptr<Runway> RoutingEngine::select_by_latency(
     const std::string& target,
     const std::vector<std::shared_ptr<Runway>>& runways) {
     
-    std::shared_ptr<Runway> best_runway = nullptr;
-    double best_latency = 1e9;
-    
-    for (const auto& runway : runways) {
-        auto metrics = tracker_->get_metrics(target, runway->id);
-        if (metrics && metrics->avg_response_time > 0.0) {
-            if (metrics->avg_response_time < best_latency) {
-                best_latency = metrics->avg_response_time;
-                best_runway = runway;
+    // The tracker keeps the lowest-latency accessible runway cached per
+    // target, so this avoids one locked metrics copy per candidate runway
+    std::string best_id = tracker_->get_best_runway(target);
+    if (!best_id.empty()) {
+        for (const auto& runway : runways) {
+            if (runway->id == best_id) {
+                return runway;
             }
         }
     }
-    
-    if (best_runway) {
-        return best_runway;
-    }
-    
+
     // Fallback to first accessible
     return select_first_accessible(target, runways);
 }
@@ -88,16 +101,15 @@ std::shared_ptr<Runway> RoutingEngine::select_first_accessible(
 }
 
 std::shared_ptr<Runway> RoutingEngine::select_round_robin(
-    const std::string& target,
+    const std::string& /*target*/,
     const std::vector<std::shared_ptr<Runway>>& runways) {
-    
+
     if (runways.empty()) {
         return nullptr;
     }
-    
-    std::lock_guard<std::mutex> lock(rr_mutex_);
-    size_t& index = round_robin_index_[target];
-    std::shared_ptr<Runway> selected = runways[index % runways.size()];
-    index = (index + 1) % runways.size();
-    return selected;
+
+    // Single atomic counter shared across targets: rotation only needs to
+    // spread load, and this avoids a mutex plus an ever-growing per-target map
+    uint64_t index = round_robin_counter_.fetch_add(1, std::memory_order_relaxed);
+    return runways[index % runways.size()];
 }
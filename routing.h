@@ -5,6 +5,7 @@
 #include <vector>
 #include <memory>
 #include <mutex>
+#include <atomic>
 #include "runway.h"
 #include "tracker.h"
 #include "config.h"
@@ -24,8 +25,7 @@ private:
     std::shared_ptr<TargetAccessibilityTracker> tracker_;
     mutable RoutingMode mode_;
     mutable std::mutex mode_mutex_;
-    std::map<std::string, size_t> round_robin_index_;
-    mutable std::mutex rr_mutex_;
+    std::atomic<uint64_t> round_robin_counter_;
     
     std::shared_ptr<Runway> select_by_latency(const std::string& target,
                                                const std::vector<std::shared_ptr<Runway>>& runways);
@@ -27,10 +27,16 @@ struct DNSServer {
 
 struct UpstreamProxy {
     UpstreamProxyConfig config;
+    // config.host resolved to an IP literal, filled once at discovery when
+    // the host is a hostname (empty if that resolution failed). Saves a
+    // resolver round trip on every tunnel dialed through this proxy; proxy
+    // addresses are operator-configured and effectively static for the
+    // lifetime of the process
+    std::string resolved_host;
     bool accessible;
     uint64_t last_success; // Unix timestamp
     uint32_t failure_count;
-    
+
     UpstreamProxy() : accessible(true), last_success(0), failure_count(0) {}
     UpstreamProxy(const UpstreamProxyConfig& cfg)
         : config(cfg), accessible(true), last_success(0), failure_count(0) {}
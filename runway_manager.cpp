@@ -1,8 +1,12 @@
 #include "runway_manager.h"
 #include "network.h"
 #include "utils.h"
+#include "logger.h"
+#include "buffered_reader.h"
 #include <sstream>
 #include <ctime>
+#include <chrono>
+#include <thread>
 #include <algorithm>
 
 #ifdef _WIN32
@@ -14,19 +18,101 @@
 #include <sys/socket.h>
 #include <netinet/in.h>
 #include <arpa/inet.h>
+#include <unistd.h>
+#include <poll.h>
 #endif
 
+#if defined(__linux__)
+#include <cstring>
+#include <linux/netlink.h>
+#include <linux/rtnetlink.h>
+#endif
+
+namespace {
+
+// Minimal HEAD round trip over an already-connected socket, leaving the
+// connection reusable (HEAD responses carry no body, RFC 7231 Section 4.3.2).
+// Used to verify pooled probe connections: the pool's MSG_PEEK liveness
+// check only proves no FIN has arrived, not that the path still works.
+// Any HTTP status line back counts - a proxy answering 405 is still up.
+bool head_roundtrip(socket_t sock, const std::string& host) {
+    std::string request;
+    request.reserve(64 + host.size() * 2);
+    request.append("HEAD http://").append(host).append("/ HTTP/1.1\r\nHost: ")
+           .append(host).append("\r\nConnection: keep-alive\r\n\r\n");
+
+    size_t sent = 0;
+    while (sent < request.size()) {
+        ssize_t n = network::send_data(sock, request.data() + sent, request.size() - sent);
+        if (n <= 0) {
+            return false;
+        }
+        sent += static_cast<size_t>(n);
+    }
+
+    BufferedSocketReader reader(sock);
+    std::string line;
+    if (!reader.read_line(line) || line.compare(0, 5, "HTTP/") != 0) {
+        return false;
+    }
+
+    // Drain the header block so the next user of this connection does not
+    // read our response
+    while (reader.read_line(line)) {
+        if (line.empty()) {
+            return true;
+        }
+    }
+    return false;
+}
+
+// Monotonic seconds for the discovery rate limit: a wall-clock step (NTP)
+// must not re-open the refresh window early or pin it shut
+uint64_t monotonic_seconds() {
+    return static_cast<uint64_t>(std::chrono::duration_cast<std::chrono::seconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count());
+}
+
+} // namespace
+
 RunwayManager::RunwayManager(
     const std::vector<std::string>& interfaces,
     const std::vector<UpstreamProxyConfig>& upstream_proxies,
     const std::vector<DNSServerConfig>& dns_servers,
     std::shared_ptr<DNSResolver> dns_resolver)
     : interfaces_(interfaces)
-    , dns_resolver_(dns_resolver) {
+    , dns_resolver_(dns_resolver)
+    , upstream_pool_(std::make_shared<UpstreamConnectionPool>())
+    , last_discovery_time_(0)
+    , watcher_running_(false)
+    , netlink_fd_(-1) {
     
     // Convert configs to runtime objects
     for (const auto& proxy_cfg : upstream_proxies) {
-        upstream_proxies_.push_back(std::make_shared<UpstreamProxy>(proxy_cfg));
+        auto proxy = std::make_shared<UpstreamProxy>(proxy_cfg);
+        if (dns_resolver_->is_ip_address(proxy_cfg.host)) {
+            proxy->resolved_host = proxy_cfg.host;
+        }
+        upstream_proxies_.push_back(proxy);
+    }
+
+    // Resolve hostname-addressed proxies once here, while startup is still
+    // single-threaded, so tunnel dials can use the cached literal without a
+    // resolver round trip (or any locking on the shared struct). The lookups
+    // run in parallel: done serially, several proxies behind a slow or dead
+    // DNS server would stack their full timeouts onto startup, while in
+    // parallel startup pays only the slowest one.
+    std::vector<std::thread> resolvers;
+    for (auto& proxy : upstream_proxies_) {
+        if (!proxy->resolved_host.empty()) {
+            continue; // Literal address, nothing to look up
+        }
+        resolvers.emplace_back([this, proxy]() {
+            proxy->resolved_host = dns_resolver_->resolve(proxy->config.host).first;
+        });
+    }
+    for (auto& resolver : resolvers) {
+        resolver.join();
     }
     
     for (const auto& dns_cfg : dns_servers) {
@@ -34,9 +120,70 @@ RunwayManager::RunwayManager(
     }
     
     discover_interfaces();
+    start_link_watcher();
 }
 
 RunwayManager::~RunwayManager() {
+    if (watcher_running_) {
+        watcher_running_ = false;
+        if (link_watcher_.joinable()) {
+            link_watcher_.join();
+        }
+    }
+#if defined(__linux__)
+    if (netlink_fd_ >= 0) {
+        close(netlink_fd_);
+    }
+#endif
+}
+
+void RunwayManager::start_link_watcher() {
+#if defined(__linux__)
+    // Best-effort: without the watcher the time-based rate limit still
+    // refreshes the snapshot, just up to one window late
+    netlink_fd_ = socket(AF_NETLINK, SOCK_RAW | SOCK_CLOEXEC, NETLINK_ROUTE);
+    if (netlink_fd_ < 0) {
+        return;
+    }
+
+    struct sockaddr_nl addr;
+    std::memset(&addr, 0, sizeof(addr));
+    addr.nl_family = AF_NETLINK;
+    addr.nl_groups = RTMGRP_LINK | RTMGRP_IPV4_IFADDR;
+    if (bind(netlink_fd_, reinterpret_cast<struct sockaddr*>(&addr), sizeof(addr)) < 0) {
+        close(netlink_fd_);
+        netlink_fd_ = -1;
+        return;
+    }
+
+    watcher_running_ = true;
+    link_watcher_ = std::thread(&RunwayManager::link_watcher_loop, this);
+#endif
+}
+
+void RunwayManager::link_watcher_loop() {
+#if defined(__linux__)
+    char buf[4096];
+    while (watcher_running_) {
+        struct pollfd pfd;
+        pfd.fd = netlink_fd_;
+        pfd.events = POLLIN;
+        pfd.revents = 0;
+        // Finite timeout so the loop notices shutdown without a self-pipe
+        if (poll(&pfd, 1, 500) <= 0) {
+            continue;
+        }
+        ssize_t len = recv(netlink_fd_, buf, sizeof(buf), 0);
+        if (len <= 0) {
+            continue;
+        }
+
+        // Which link or address changed does not matter - the next walk
+        // re-reads the whole table either way, so no message parsing
+        std::lock_guard<std::mutex> lock(mutex_);
+        last_discovery_time_ = 0;
+    }
+#endif
 }
 
 uint64_t RunwayManager::get_current_time() const {
@@ -49,9 +196,26 @@ uint64_t RunwayManager::get_current_time() const {
 #endif
 }
 
-void RunwayManager::discover_interfaces() {
-    std::lock_guard<std::mutex> lock(mutex_);
-    
+bool RunwayManager::discover_interfaces() {
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+
+        // Interface sets change rarely; cap how often we walk the OS
+        // interface list so overlapping callers (health cycle, TUI refresh,
+        // probes) don't each pay for a full enumeration. Claiming the window
+        // under the lock also means at most one thread runs the walk below
+        const uint64_t min_refresh_interval_secs = 5;
+        uint64_t now = monotonic_seconds();
+        if (last_discovery_time_ != 0 && now - last_discovery_time_ < min_refresh_interval_secs) {
+            return false;
+        }
+        last_discovery_time_ = now;
+    }
+
+    // The OS enumeration itself runs unlocked - it is one kernel dump of the
+    // whole interface table, but there is no reason to stall runway lookups
+    // on it. The fresh snapshot is swapped in under the lock at the end.
+
 #ifdef _WIN32
     // Windows: Use GetAdaptersAddresses
     ULONG buffer_size = 15000;
@@ -86,14 +250,16 @@ void RunwayManager::discover_interfaces() {
                 }
             }
         }
-        
-        interface_info_ = current_interfaces;
+
+        std::lock_guard<std::mutex> lock(mutex_);
+        interface_info_ = std::move(current_interfaces);
     }
+    return result == NO_ERROR;
 #else
     // POSIX: Use getifaddrs
     struct ifaddrs* ifaddr = nullptr;
     if (getifaddrs(&ifaddr) == -1) {
-        return;
+        return false;
     }
     
     std::map<std::string, InterfaceInfo> current_interfaces;
@@ -120,24 +286,56 @@ void RunwayManager::discover_interfaces() {
     }
     
     freeifaddrs(ifaddr);
-    interface_info_ = current_interfaces;
+
+    std::lock_guard<std::mutex> lock(mutex_);
+    interface_info_ = std::move(current_interfaces);
+    return true;
 #endif
 }
 
 void RunwayManager::refresh_interfaces() {
-    std::map<std::string, InterfaceInfo> old_interfaces = interface_info_;
-    discover_interfaces();
-    
-    // Log changes (defensive: check terminal before logging)
+    // Snapshot name -> ip - copying the whole InterfaceInfo map per refresh
+    // (and doing it without the lock, as this used to) is wasted work when
+    // all we need is the before/after difference
+    std::map<std::string, std::string> old_ips;
+    {
+        std::lock_guard<std::mutex> lock(mutex_);
+        for (const auto& pair : interface_info_) {
+            old_ips[pair.first] = pair.second.ip;
+        }
+    }
+
+    if (!discover_interfaces()) {
+        // Rate-limited: the snapshot did not change, so there is no
+        // before/after difference to diff or log
+        return;
+    }
+
+    std::lock_guard<std::mutex> lock(mutex_);
     for (const auto& pair : interface_info_) {
-        if (old_interfaces.find(pair.first) == old_interfaces.end()) {
-            // New interface
+        auto old_it = old_ips.find(pair.first);
+        if (old_it == old_ips.end()) {
+            Logger::instance().log(LogLevel::INFO,
+                "Interface appeared: " + pair.first + " (" + pair.second.ip + ")");
+        } else if (old_it->second != pair.second.ip) {
+            // DHCP renewals and the like: runways cache the source address
+            // captured at discovery, and dials bound to the old address
+            // would fail (or worse, leak out another interface) until the
+            // next full rediscovery. Patch them in place.
+            Logger::instance().log(LogLevel::INFO,
+                "Interface " + pair.first + " changed address: " +
+                old_it->second + " -> " + pair.second.ip);
+            for (auto& runway_pair : runways_) {
+                if (runway_pair.second->interface_name == pair.first) {
+                    runway_pair.second->source_ip = pair.second.ip;
+                }
+            }
         }
     }
-    
-    for (const auto& pair : old_interfaces) {
+
+    for (const auto& pair : old_ips) {
         if (interface_info_.find(pair.first) == interface_info_.end()) {
-            // Removed interface
+            Logger::instance().log(LogLevel::INFO, "Interface disappeared: " + pair.first);
         }
     }
 }
@@ -194,7 +392,8 @@ std::vector<std::shared_ptr<Runway>> RunwayManager::discover_runways() {
             }
         }
     }
-    
+
+    rebuild_snapshot_locked();
     return runways;
 }
 
@@ -208,38 +407,62 @@ std::shared_ptr<Runway> RunwayManager::get_runway(const std::string& runway_id)
 }
 
 std::vector<std::shared_ptr<Runway>> RunwayManager::get_all_runways() {
+    return *get_runways_snapshot();
+}
+
+std::shared_ptr<const std::vector<std::shared_ptr<Runway>>> RunwayManager::get_runways_snapshot() {
     std::lock_guard<std::mutex> lock(mutex_);
-    std::vector<std::shared_ptr<Runway>> result;
+    if (!runways_snapshot_) {
+        rebuild_snapshot_locked();
+    }
+    return runways_snapshot_;
+}
+
+void RunwayManager::rebuild_snapshot_locked() {
+    auto snapshot = std::make_shared<std::vector<std::shared_ptr<Runway>>>();
+    snapshot->reserve(runways_.size());
     for (const auto& pair : runways_) {
-        result.push_back(pair.second);
+        snapshot->push_back(pair.second);
+    }
+    runways_snapshot_ = std::move(snapshot);
+}
+
+std::string RunwayManager::resolve_target(const std::string& target) {
+    if (dns_resolver_->is_ip_address(target) || dns_resolver_->is_private_ip(target)) {
+        return target;
     }
-    return result;
+    return dns_resolver_->resolve(target).first;
 }
 
 std::tuple<bool, bool, double> RunwayManager::test_runway_accessibility(
     const std::string& target, std::shared_ptr<Runway> runway, double timeout_secs) {
-    
-    // Resolve target if needed
-    std::string resolved_ip;
-    if (dns_resolver_->is_ip_address(target) || dns_resolver_->is_private_ip(target)) {
-        resolved_ip = target;
-    } else {
-        auto result = dns_resolver_->resolve(target);
-        if (result.first.empty()) {
-            return std::make_tuple(false, false, 0.0);
-        }
-        resolved_ip = result.first;
+
+    std::string resolved_ip = resolve_target(target);
+    if (resolved_ip.empty()) {
+        return std::make_tuple(false, false, 0.0);
     }
-    
-    // Test connection
+    return test_runway_accessibility_resolved(resolved_ip, runway, timeout_secs);
+}
+
+std::tuple<bool, bool, double> RunwayManager::test_runway_accessibility_resolved(
+    const std::string& resolved_ip, std::shared_ptr<Runway> runway, double timeout_secs) {
+
+    // Test connection, timing it on the monotonic clock: wall-clock time can
+    // step (NTP) and would poison the tracker's latency averages with
+    // negative or inflated samples
+    auto probe_start = std::chrono::steady_clock::now();
     bool network_success = false;
     if (runway->upstream_proxy && runway->upstream_proxy->accessible) {
         network_success = test_proxy_connection(runway, resolved_ip, timeout_secs);
     } else {
         network_success = test_direct_connection(runway, resolved_ip, timeout_secs);
     }
-    
-    double response_time = 0.0; // Simplified
+
+    double response_time = 0.0;
+    if (network_success) {
+        response_time = std::chrono::duration<double>(
+            std::chrono::steady_clock::now() - probe_start).count();
+    }
     bool user_success = network_success; // Simplified for now
     return std::make_tuple(network_success, user_success, response_time);
 }
@@ -247,32 +470,43 @@ std::tuple<bool, bool, double> RunwayManager::test_runway_accessibility(
 bool RunwayManager::test_direct_connection(
     std::shared_ptr<Runway> runway, const std::string& target_ip, double timeout_secs) {
     
-    std::lock_guard<std::mutex> lock(mutex_);
-    if (interface_info_.find(runway->interface_name) == interface_info_.end()) {
-        return false;
-    }
-    
-    socket_t sock = network::create_tcp_socket();
+    // No interface-table lookup here: the runway already carries the source
+    // IP captured at discovery, and taking mutex_ per probe serialized every
+    // concurrent probe against interface discovery. If the interface has
+    // since disappeared, the pool's bind to the stale address fails and the
+    // probe reports inaccessible - the same outcome, without the lock.
+
+    // Probe through the connection pool: repeated probes of the same
+    // (target, interface) pair reuse a warm keep-alive connection instead of
+    // paying a fresh 3-way handshake and leaving a TIME_WAIT socket behind
+    // every probe interval. The pool binds new dials to the runway's source
+    // address, so the probe still exercises this runway's interface, and a
+    // successful reuse doubles as an in-band liveness check.
+    bool reused = false;
+    socket_t sock = upstream_pool_->acquire(target_ip, 80, runway->source_ip,
+                                            timeout_secs, reused);
     if (sock == network::INVALID_SOCKET_VALUE) {
         return false;
     }
-    
-    // Set timeout
-    struct timeval timeout;
-    timeout.tv_sec = static_cast<long>(timeout_secs);
-    timeout.tv_usec = static_cast<long>((timeout_secs - timeout.tv_sec) * 1000000);
-    
-#ifdef _WIN32
-    setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, reinterpret_cast<const char*>(&timeout), sizeof(timeout));
-    setsockopt(sock, SOL_SOCKET, SO_SNDTIMEO, reinterpret_cast<const char*>(&timeout), sizeof(timeout));
-#else
-    setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof(timeout));
-    setsockopt(sock, SOL_SOCKET, SO_SNDTIMEO, &timeout, sizeof(timeout));
-#endif
-    
-    bool success = network::connect_socket(sock, target_ip, 80);
-    network::close_socket(sock);
-    return success;
+
+    // A fresh dial just proved reachability with a real handshake (and its
+    // timing is a real RTT). A reused socket proved nothing yet, so make it
+    // earn its keep with an in-band HEAD round trip; if that fails the
+    // connection was stale despite the PEEK check - drop it and dial fresh
+    // so the probe still measures the actual path.
+    if (reused && !head_roundtrip(sock, target_ip)) {
+        upstream_pool_->discard(sock);
+        reused = false;
+        sock = upstream_pool_->acquire(target_ip, 80, runway->source_ip,
+                                       timeout_secs, reused);
+        if (sock == network::INVALID_SOCKET_VALUE) {
+            return false;
+        }
+    }
+
+    // Keep the connection warm for the next probe of this target
+    upstream_pool_->release(target_ip, 80, runway->source_ip, sock);
+    return true;
 }
 
 bool RunwayManager::test_proxy_connection(
@@ -281,29 +515,43 @@ bool RunwayManager::test_proxy_connection(
     if (!runway->upstream_proxy || !runway->upstream_proxy->accessible) {
         return false;
     }
-    
+
     // Simplified proxy test - would need full HTTP CONNECT or proxy protocol
-    // For now, just test if we can connect to the proxy
-    socket_t sock = network::create_tcp_socket();
+    // For now, just test if we can reach the proxy.
+    // Go through the connection pool: a reused keep-alive connection both
+    // proves the proxy is reachable and avoids a fresh handshake per probe.
+    // Prefer the IP cached at discovery: the pool dials literals, and this
+    // also keys the probe's pooled connections the same way tunnel dials do
+    const std::string& proxy_host = runway->upstream_proxy->resolved_host.empty()
+        ? runway->upstream_proxy->config.host
+        : runway->upstream_proxy->resolved_host;
+
+    bool reused = false;
+    socket_t sock = upstream_pool_->acquire(proxy_host,
+                                            runway->upstream_proxy->config.port,
+                                            runway->source_ip,
+                                            timeout_secs, reused);
     if (sock == network::INVALID_SOCKET_VALUE) {
         return false;
     }
-    
-    struct timeval timeout;
-    timeout.tv_sec = static_cast<long>(timeout_secs);
-    timeout.tv_usec = static_cast<long>((timeout_secs - timeout.tv_sec) * 1000000);
-    
-#ifdef _WIN32
-    setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, reinterpret_cast<const char*>(&timeout), sizeof(timeout));
-    setsockopt(sock, SOL_SOCKET, SO_SNDTIMEO, reinterpret_cast<const char*>(&timeout), sizeof(timeout));
-#else
-    setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof(timeout));
-    setsockopt(sock, SOL_SOCKET, SO_SNDTIMEO, &timeout, sizeof(timeout));
-#endif
-    
-    bool success = network::connect_socket(sock, 
-                                           runway->upstream_proxy->config.host,
-                                           runway->upstream_proxy->config.port);
-    network::close_socket(sock);
-    return success;
+
+    // As in the direct probe: reused sockets must pass an in-band round
+    // trip before they count as proof the proxy is reachable
+    if (reused && !head_roundtrip(sock, proxy_host)) {
+        upstream_pool_->discard(sock);
+        reused = false;
+        sock = upstream_pool_->acquire(proxy_host,
+                                       runway->upstream_proxy->config.port,
+                                       runway->source_ip,
+                                       timeout_secs, reused);
+        if (sock == network::INVALID_SOCKET_VALUE) {
+            return false;
+        }
+    }
+
+    // Keep the connection warm for the next probe or client session
+    upstream_pool_->release(proxy_host,
+                            runway->upstream_proxy->config.port,
+                            runway->source_ip, sock);
+    return true;
 }
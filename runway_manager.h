@@ -6,9 +6,12 @@
 #include <map>
 #include <memory>
 #include <mutex>
+#include <atomic>
+#include <thread>
 #include "runway.h"
 #include "config.h"
 #include "dns.h"
+#include "connection_pool.h"
 
 // Interface discovery and runway management
 // POSIX: getifaddrs() (Linux/Unix)
@@ -32,8 +35,10 @@ public:
     
     ~RunwayManager();
     
-    // Discover available network interfaces
-    void discover_interfaces();
+    // Discover available network interfaces. Rate-limited: returns false
+    // without touching the OS when a walk ran within the last few seconds,
+    // so steady-state calls are a map read for the caller.
+    bool discover_interfaces();
     
     // Refresh interface information
     void refresh_interfaces();
@@ -46,22 +51,56 @@ public:
     
     // Get all runways
     std::vector<std::shared_ptr<Runway>> get_all_runways();
+
+    // Immutable shared snapshot of the runway list. The list only changes
+    // at (re)discovery, so per-connection callers can share one heap copy
+    // instead of each materializing a fresh vector under the lock; in-place
+    // runway updates (accessibility, DHCP address patches) are visible
+    // through the shared pointers either way.
+    std::shared_ptr<const std::vector<std::shared_ptr<Runway>>> get_runways_snapshot();
     
+    // Resolve a probe target to an IP (passthrough for literal IPs).
+    // Returns "" on failure. Exposed so callers probing one target across
+    // many runways can resolve once instead of once per runway.
+    std::string resolve_target(const std::string& target);
+
     // Test runway accessibility
     // Returns (network_success, user_success, response_time_secs)
     std::tuple<bool, bool, double> test_runway_accessibility(
         const std::string& target, std::shared_ptr<Runway> runway, double timeout_secs);
-    
+
+    // Same probe, but with the target already resolved via resolve_target()
+    std::tuple<bool, bool, double> test_runway_accessibility_resolved(
+        const std::string& resolved_ip, std::shared_ptr<Runway> runway, double timeout_secs);
+
+    // Get the shared upstream connection pool
+    std::shared_ptr<UpstreamConnectionPool> get_upstream_pool() { return upstream_pool_; }
+
 private:
     std::vector<std::string> interfaces_;
     std::vector<std::shared_ptr<UpstreamProxy>> upstream_proxies_;
     std::vector<std::shared_ptr<DNSServer>> dns_servers_;
     std::shared_ptr<DNSResolver> dns_resolver_;
+    std::shared_ptr<UpstreamConnectionPool> upstream_pool_;
     std::map<std::string, std::shared_ptr<Runway>> runways_;
+    std::shared_ptr<const std::vector<std::shared_ptr<Runway>>> runways_snapshot_;
     std::map<std::string, InterfaceInfo> interface_info_;
+    uint64_t last_discovery_time_; // Monotonic seconds of last getifaddrs/GetAdaptersAddresses walk
     std::mutex mutex_;
+
+    // Linux: rtnetlink watcher subscribed to link/address events. Any event
+    // zeroes last_discovery_time_, so the next discover_interfaces() walks
+    // the OS table immediately instead of serving the rate-limited snapshot
+    // for up to its full window after a hotplug or address change.
+    std::atomic<bool> watcher_running_;
+    std::thread link_watcher_;
+    int netlink_fd_;
+
+    void start_link_watcher();
+    void link_watcher_loop();
     
     uint64_t get_current_time() const;
+    void rebuild_snapshot_locked(); // Caller must hold mutex_
     bool test_direct_connection(std::shared_ptr<Runway> runway, const std::string& target_ip, double timeout_secs);
     bool test_proxy_connection(std::shared_ptr<Runway> runway, const std::string& target_ip, double timeout_secs);
 };
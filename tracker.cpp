@@ -1,5 +1,6 @@
 #include "tracker.h"
 #include <ctime>
+#include <chrono>
 #include <algorithm>
 
 #ifdef _WIN32
@@ -14,13 +15,11 @@ TargetAccessibilityTracker::TargetAccessibilityTracker(size_t success_rate_windo
 }
 
 uint64_t TargetAccessibilityTracker::get_current_time() const {
-#ifdef _WIN32
-    return static_cast<uint64_t>(time(nullptr));
-#else
-    struct timespec ts;
-    clock_gettime(CLOCK_REALTIME, &ts);
-    return static_cast<uint64_t>(ts.tv_sec);
-#endif
+    // Monotonic, not wall-clock: these stamps only ever feed age comparisons
+    // ("how long since the last success"), and an NTP step of the wall clock
+    // would make such ages jump backwards or balloon
+    return static_cast<uint64_t>(std::chrono::duration_cast<std::chrono::seconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count());
 }
 
 TargetMetrics& TargetAccessibilityTracker::get_or_create_metrics(
@@ -29,17 +28,32 @@ TargetMetrics& TargetAccessibilityTracker::get_or_create_metrics(
     return metrics_[target][runway_id];
 }
 
-void TargetMetrics::update_success_rate(size_t /*window*/) {
-    if (recent_attempts.empty()) {
+void TargetMetrics::record_attempt(bool success, size_t window) {
+    if (window == 0) {
+        // Defensive: a zero window means no history to keep
         success_rate = 0.0;
         return;
     }
-    
-    size_t success_count = 0;
-    for (bool attempt : recent_attempts) {
-        if (attempt) success_count++;
+
+    if (recent_attempts.size() < window) {
+        // Window still filling: append
+        recent_attempts.push_back(success);
+    } else {
+        // Window full: overwrite the oldest slot in place instead of the
+        // old erase(begin()) which shifted the whole window every update
+        if (recent_attempts[recent_pos]) {
+            recent_successes--;
+        }
+        recent_attempts[recent_pos] = success;
+        recent_pos = (recent_pos + 1) % window;
     }
-    success_rate = static_cast<double>(success_count) / recent_attempts.size();
+
+    if (success) {
+        recent_successes++;
+    }
+    success_rate = recent_attempts.empty()
+        ? 0.0
+        : static_cast<double>(recent_successes) / recent_attempts.size();
 }
 
 void TargetAccessibilityTracker::update(const std::string& target, const std::string& runway_id,
@@ -54,13 +68,9 @@ void TargetAccessibilityTracker::update(const std::string& target, const std::st
     
     metrics.total_attempts++;
     uint64_t current_time = get_current_time();
-    
-    // Update recent attempts
-    metrics.recent_attempts.push_back(user_success);
-    if (metrics.recent_attempts.size() > success_rate_window_) {
-        metrics.recent_attempts.erase(metrics.recent_attempts.begin());
-    }
-    
+
+    metrics.record_attempt(user_success, success_rate_window_);
+
     if (network_success && user_success) {
         metrics.network_success_count++;
         metrics.user_success_count++;
@@ -94,30 +104,80 @@ void TargetAccessibilityTracker::update(const std::string& target, const std::st
         metrics.state = RunwayState::Accessible;
     }
     
-    metrics.update_success_rate(success_rate_window_);
+    // Keep the per-target best-runway cache current so routing can answer
+    // latency-based selection in O(1) instead of copying metrics per runway
+    rebuild_selection_cache(target);
 }
 
-std::vector<std::string> TargetAccessibilityTracker::get_accessible_runways(const std::string& target) {
-    std::lock_guard<std::mutex> lock(mutex_);
-    std::vector<std::string> accessible;
-    
+void TargetAccessibilityTracker::rebuild_selection_cache(const std::string& target) {
     auto target_it = metrics_.find(target);
     if (target_it == metrics_.end()) {
-        return accessible;
+        return;
     }
-    
+
+    std::string best_id;
+    double best_latency = 1e9;
+
+    // (latency, runway_id) pairs for every runway the accessibility rules
+    // admit; runways with no latency sample yet get a sentinel so they sort
+    // after every measured one
+    std::vector<std::pair<double, std::string>> candidates;
+
     for (const auto& pair : target_it->second) {
         const TargetMetrics& metrics = pair.second;
-        if (metrics.state == RunwayState::Accessible) {
-            accessible.push_back(pair.first);
-        } else if (metrics.state == RunwayState::PartiallyAccessible) {
-            if (metrics.success_rate >= success_rate_threshold_) {
-                accessible.push_back(pair.first);
-            }
+
+        bool accessible = (metrics.state == RunwayState::Accessible) ||
+                          (metrics.state == RunwayState::PartiallyAccessible &&
+                           metrics.success_rate >= success_rate_threshold_);
+        if (accessible) {
+            double latency = (metrics.avg_response_time > 0.0) ? metrics.avg_response_time : 1e9;
+            candidates.emplace_back(latency, pair.first);
+        }
+
+        if (metrics.state == RunwayState::Accessible &&
+            metrics.avg_response_time > 0.0 && metrics.avg_response_time < best_latency) {
+            best_latency = metrics.avg_response_time;
+            best_id = pair.first;
         }
     }
-    
-    return accessible;
+
+    if (best_id.empty()) {
+        best_runway_.erase(target);
+    } else {
+        best_runway_[target] = best_id;
+    }
+
+    // Ties (including the no-sample sentinel) break on runway id so the
+    // order is deterministic across rebuilds
+    std::sort(candidates.begin(), candidates.end());
+
+    auto& sorted = accessible_sorted_[target];
+    sorted.clear();
+    sorted.reserve(candidates.size());
+    for (auto& candidate : candidates) {
+        sorted.push_back(std::move(candidate.second));
+    }
+}
+
+std::string TargetAccessibilityTracker::get_best_runway(const std::string& target) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    auto it = best_runway_.find(target);
+    if (it == best_runway_.end()) {
+        return std::string();
+    }
+    return it->second;
+}
+
+std::vector<std::string> TargetAccessibilityTracker::get_accessible_runways(const std::string& target) {
+    std::lock_guard<std::mutex> lock(mutex_);
+
+    // Served straight from the cache rebuilt at probe time; a request-path
+    // caller gets the fastest-first order without rescanning the metrics
+    auto it = accessible_sorted_.find(target);
+    if (it == accessible_sorted_.end()) {
+        return std::vector<std::string>();
+    }
+    return it->second;
 }
 
 std::shared_ptr<TargetMetrics> TargetAccessibilityTracker::get_metrics(
@@ -146,6 +206,33 @@ std::vector<std::string> TargetAccessibilityTracker::get_all_targets() {
     return targets;
 }
 
+std::map<std::string, RunwayState> TargetAccessibilityTracker::get_runway_state_summary() {
+    std::lock_guard<std::mutex> lock(mutex_);
+
+    // Rank states so a runway that works for any target shows as working
+    auto rank = [](RunwayState state) {
+        switch (state) {
+            case RunwayState::Accessible: return 3;
+            case RunwayState::PartiallyAccessible: return 2;
+            case RunwayState::Inaccessible: return 1;
+            default: return 0;
+        }
+    };
+
+    std::map<std::string, RunwayState> summary;
+    for (const auto& target_pair : metrics_) {
+        for (const auto& runway_pair : target_pair.second) {
+            auto it = summary.find(runway_pair.first);
+            if (it == summary.end()) {
+                summary[runway_pair.first] = runway_pair.second.state;
+            } else if (rank(runway_pair.second.state) > rank(it->second)) {
+                it->second = runway_pair.second.state;
+            }
+        }
+    }
+    return summary;
+}
+
 std::map<std::string, TargetMetrics> TargetAccessibilityTracker::get_target_metrics(const std::string& target) {
     std::lock_guard<std::mutex> lock(mutex_);
     
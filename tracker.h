@@ -18,13 +18,19 @@ struct TargetMetrics {
     uint64_t partial_success_count;
     uint64_t total_attempts;
     double avg_response_time;
-    uint64_t last_success_time; // Unix timestamp
-    uint64_t last_failure_time; // Unix timestamp
+    uint64_t last_success_time; // Monotonic seconds (see Tracker::get_current_time)
+    uint64_t last_failure_time; // Monotonic seconds
     uint32_t consecutive_failures;
     uint64_t recovery_count;
     double success_rate;
-    std::vector<bool> recent_attempts; // Last N attempts (true=success, false=failure)
-    
+    // Last N attempts as a ring (true=success). vector<bool> packs one bit
+    // per attempt; the ring index avoids the O(N) front-erase the old
+    // sliding window paid on every update, and recent_successes keeps the
+    // success rate O(1) instead of a rescan
+    std::vector<bool> recent_attempts;
+    size_t recent_pos;       // Next slot to overwrite once the window is full
+    size_t recent_successes; // Successes currently inside the window
+
     TargetMetrics() 
         : state(RunwayState::Unknown)
         , network_success_count(0)
@@ -37,8 +43,10 @@ struct TargetMetrics {
         , last_failure_time(0)
         , consecutive_failures(0)
         , recovery_count(0)
-        , success_rate(0.0) {}
-    
+        , success_rate(0.0)
+        , recent_pos(0)
+        , recent_successes(0) {}
+
     TargetMetrics(const std::string& target, const std::string& runway_id)
         : target(target)
         , runway_id(runway_id)
@@ -53,9 +61,12 @@ struct TargetMetrics {
         , last_failure_time(0)
         , consecutive_failures(0)
         , recovery_count(0)
-        , success_rate(0.0) {}
-    
-    void update_success_rate(size_t window);
+        , success_rate(0.0)
+        , recent_pos(0)
+        , recent_successes(0) {}
+
+    // Record one attempt into the window and refresh success_rate
+    void record_attempt(bool success, size_t window);
 };
 
 class TargetAccessibilityTracker {
@@ -65,22 +76,42 @@ public:
     void update(const std::string& target, const std::string& runway_id,
                 bool network_success, bool user_success, double response_time_secs);
     
+    // Accessible runway ids for target, fastest first; runways without a
+    // latency sample yet sort last
     std::vector<std::string> get_accessible_runways(const std::string& target);
+
+    // Lowest-latency accessible runway for target (cached, O(1))
+    // Returns empty string if no runway has a usable latency sample yet
+    std::string get_best_runway(const std::string& target);
     
     std::shared_ptr<TargetMetrics> get_metrics(const std::string& target, const std::string& runway_id);
     
     std::vector<std::string> get_all_targets();
+
+    // One-lock snapshot of each runway's best state across all targets,
+    // for display code that redraws every frame: per-row get_metrics calls
+    // multiply lock acquisitions and metric copies by runways x targets.
+    // Accessible outranks PartiallyAccessible outranks Inaccessible.
+    std::map<std::string, RunwayState> get_runway_state_summary();
     
     std::map<std::string, TargetMetrics> get_target_metrics(const std::string& target);
     
 private:
     std::map<std::string, std::map<std::string, TargetMetrics>> metrics_; // target -> runway_id -> metrics
+    std::map<std::string, std::string> best_runway_; // target -> lowest-latency accessible runway_id
+    // target -> accessible runway ids ordered fastest-first. Rebuilt on each
+    // probe result, so selection and alternative lookups are plain reads:
+    // the sorting cost sits on the per-probe path, not the per-request one
+    std::map<std::string, std::vector<std::string>> accessible_sorted_;
     size_t success_rate_window_;
     double success_rate_threshold_;
     std::mutex mutex_;
     
     TargetMetrics& get_or_create_metrics(const std::string& target, const std::string& runway_id);
     uint64_t get_current_time() const;
+    // Rebuild best_runway_ and accessible_sorted_ for target after a probe
+    // result changed its metrics. Caller must hold mutex_.
+    void rebuild_selection_cache(const std::string& target);
 };
 
 #endif // TRACKER_H
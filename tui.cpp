@@ -29,6 +29,7 @@
 #include <sys/ioctl.h>
 #include <termios.h>
 #include <fcntl.h>
+#include <poll.h>
 #endif
 
 // Cross-platform unused parameter macro
@@ -51,6 +52,7 @@ TUI::TUI(std::shared_ptr<RunwayManager> runway_manager,
     , running_(false)
     , should_redraw_(true)
     , terminal_resized_(false)
+    , full_repaint_needed_(true)
     , start_time_(std::time(nullptr))
     , cached_rows_(0)
     , cached_cols_(0)
@@ -63,10 +65,27 @@ TUI::TUI(std::shared_ptr<RunwayManager> runway_manager,
     , detail_view_(false)
     , detail_item_id_("")
     , quit_confirmed_(false) {
+#ifndef _WIN32
+    wake_pipe_[0] = -1;
+    wake_pipe_[1] = -1;
+    if (pipe(wake_pipe_) == 0) {
+        // Non-blocking on both ends: a full pipe just means a wake is
+        // already pending, and the drain must never stall the UI loop
+        fcntl(wake_pipe_[0], F_SETFL, fcntl(wake_pipe_[0], F_GETFL, 0) | O_NONBLOCK);
+        fcntl(wake_pipe_[1], F_SETFL, fcntl(wake_pipe_[1], F_GETFL, 0) | O_NONBLOCK);
+    } else {
+        wake_pipe_[0] = -1;
+        wake_pipe_[1] = -1;
+    }
+#endif
 }
 
 TUI::~TUI() {
     stop();
+#ifndef _WIN32
+    if (wake_pipe_[0] >= 0) close(wake_pipe_[0]);
+    if (wake_pipe_[1] >= 0) close(wake_pipe_[1]);
+#endif
 }
 
 void TUI::setup_terminal() {
@@ -326,8 +345,38 @@ void TUI::run(volatile sig_atomic_t* shutdown_flag) {
             last_update = now;
         }
         
+#ifdef _WIN32
         // Minimal sleep for maximum responsiveness (10ms = 100fps theoretical max)
         std::this_thread::sleep_for(std::chrono::milliseconds(10));
+#else
+        // Sleep inside poll() on stdin plus the wake pipe rather than a
+        // fixed 10ms nap: an idle TUI used to wake 100 times a second just
+        // to ask "any key yet?". poll() wakes immediately on a keypress or
+        // a connection update (better responsiveness than the nap ever
+        // gave) and otherwise sleeps until the next scheduled redraw,
+        // cutting idle wakeups by an order of magnitude.
+        auto elapsed_ms = std::chrono::duration_cast<std::chrono::milliseconds>(
+            std::chrono::steady_clock::now() - last_update);
+        int wait_ms = static_cast<int>((update_interval - elapsed_ms).count());
+        if (wait_ms < 1) wait_ms = 1;
+        if (wait_ms > 100) wait_ms = 100;
+
+        struct pollfd pfds[2];
+        pfds[0].fd = STDIN_FILENO;
+        pfds[0].events = POLLIN;
+        pfds[0].revents = 0;
+        pfds[1].fd = wake_pipe_[0]; // poll() ignores negative fds
+        pfds[1].events = POLLIN;
+        pfds[1].revents = 0;
+        poll(pfds, 2, wait_ms); // Stdin input is consumed by handle_input()
+
+        if (pfds[1].revents & POLLIN) {
+            // Drain the wake pipe: coalesced wakes need only one redraw
+            char drain[64];
+            while (read(wake_pipe_[0], drain, sizeof(drain)) > 0) {
+            }
+        }
+#endif
     }
     
     // Only restore terminal if we didn't already do it for shutdown
@@ -341,15 +390,32 @@ void TUI::stop() {
 }
 
 void TUI::update_connection(const ConnectionInfo& conn) {
-    std::lock_guard<std::mutex> lock(connections_mutex_);
-    connections_[conn.id] = conn;
+    {
+        std::lock_guard<std::mutex> lock(connections_mutex_);
+        connections_[conn.id] = conn;
+    }
     should_redraw_ = true;
+    wake();
 }
 
 void TUI::remove_connection(const std::string& conn_id) {
-    std::lock_guard<std::mutex> lock(connections_mutex_);
-    connections_.erase(conn_id);
+    {
+        std::lock_guard<std::mutex> lock(connections_mutex_);
+        connections_.erase(conn_id);
+    }
     should_redraw_ = true;
+    wake();
+}
+
+void TUI::wake() {
+#ifndef _WIN32
+    if (wake_pipe_[1] >= 0) {
+        char byte = 1;
+        // EAGAIN (pipe full) is fine: a wake is already pending
+        ssize_t written = write(wake_pipe_[1], &byte, 1);
+        (void)written;
+    }
+#endif
 }
 
 void TUI::draw() {
@@ -368,6 +434,7 @@ void TUI::draw() {
         std::cout << "Current: " << raw_cols << "x" << raw_rows << "\n";
         std::cout << "Please resize your terminal window.\n";
         std::cout.flush();
+        full_repaint_needed_ = true; // Warning text must not bleed into the next frame
         return;
     }
     
@@ -377,9 +444,16 @@ void TUI::draw() {
     
     // Build entire frame in stringstream for single atomic output
     std::stringstream output;
-    
-    // Clear screen and position cursor at row 1, col 1
-    output << "\033[2J\033[1;1H";
+
+    // Full-screen erase only when the previous frame cannot be trusted
+    // (first draw, resize); otherwise repaint over it in place - every row
+    // is drawn at an explicit position and padded to width, so overwriting
+    // is complete and the screen never blanks between frames
+    if (full_repaint_needed_ || terminal_resized_) {
+        output << "\033[2J";
+        full_repaint_needed_ = false;
+    }
+    output << "\033[1;1H";
     
     // Draw detail view if active
     if (detail_view_) {
@@ -414,6 +488,10 @@ void TUI::draw() {
         draw_command_bar(output, cols);
     }
     
+    // Anything below the last drawn row (e.g. after shrinking content) is
+    // cleared in the same write as the frame itself
+    output << "\033[0J";
+
     // Single atomic output for maximum responsiveness
     std::cout << output.str();
     std::cout.flush();
@@ -934,42 +1012,36 @@ void TUI::draw_runways_tab(std::stringstream& output, int cols, int max_rows) {
     }
     
     draw_table_header(output, columns, cols);
-    
+
     // Table rows
     size_t start_idx = static_cast<size_t>(scroll_offset_);
     size_t end_idx = std::min(start_idx + static_cast<size_t>(visible_items), runways.size());
-    
+
+    // One tracker snapshot for the whole frame: the old per-row scan took
+    // the tracker lock (and copied a metrics struct) once per runway per
+    // target, every redraw
+    auto state_summary = tracker_->get_runway_state_summary();
+
     for (size_t i = start_idx; i < end_idx; ++i) {
         auto runway = runways[i];
         int display_idx = static_cast<int>(i);
-        bool is_selected = (current_tab_ == Tab::Runways && 
+        bool is_selected = (current_tab_ == Tab::Runways &&
                            display_idx == selected_index_ && !detail_view_);
         bool is_alternate = (i % 2 == 1);
-        
-        // Get status symbol - try to find a target to check status
-        std::string status_symbol = "?";
-        std::string status_color = "";
-        auto targets = tracker_->get_all_targets();
-        bool found_status = false;
-        for (const auto& target : targets) {
-            auto metrics = tracker_->get_metrics(target, runway->id);
-            if (metrics) {
-                if (metrics->state == RunwayState::Accessible) {
-                    status_symbol = "✓";
-                    status_color = "\033[32m";
-                    found_status = true;
-                    break;
-                } else if (metrics->state == RunwayState::PartiallyAccessible && !found_status) {
-                    status_symbol = "⚠";
-                    status_color = "\033[33m";
-                    found_status = true;
-                } else if (metrics->state == RunwayState::Inaccessible && !found_status) {
-                    status_symbol = "✗";
-                    status_color = "\033[31m";
-                }
-            }
-        }
-        if (!found_status) {
+
+        // Status symbol from the runway's best state across targets; with
+        // no usable probe data yet, fall back to a type-based guess
+        std::string status_symbol;
+        std::string status_color;
+        auto state_it = state_summary.find(runway->id);
+        if (state_it != state_summary.end() && state_it->second == RunwayState::Accessible) {
+            status_symbol = "✓";
+            status_color = "\033[32m";
+        } else if (state_it != state_summary.end() &&
+                   state_it->second == RunwayState::PartiallyAccessible) {
+            status_symbol = "⚠";
+            status_color = "\033[33m";
+        } else {
             // Default based on type
             status_symbol = runway->is_direct ? "✓" : "⚠";
             status_color = runway->is_direct ? "\033[32m" : "\033[33m";
@@ -1701,38 +1773,8 @@ std::vector<std::string> TUI::get_targets_snapshot() {
 }
 
 std::vector<ConnectionInfo> TUI::get_connections_snapshot() {
-    // Get live connection data from proxy server
-    auto live_conns = proxy_server_->get_active_connections_info();
-    std::vector<ConnectionInfo> result;
-    
-    for (const auto& conn_map : live_conns) {
-        ConnectionInfo conn;
-        conn.id = conn_map.count("id") ? conn_map.at("id") : "";
-        conn.client_ip = conn_map.count("client_ip") ? conn_map.at("client_ip") : "";
-        if (conn_map.count("client_port")) {
-            utils::safe_str_to_uint16(conn_map.at("client_port"), conn.client_port);
-        }
-        conn.target_host = conn_map.count("target_host") ? conn_map.at("target_host") : "";
-        if (conn_map.count("target_port")) {
-            utils::safe_str_to_uint16(conn_map.at("target_port"), conn.target_port);
-        }
-        conn.runway_id = conn_map.count("runway_id") ? conn_map.at("runway_id") : "";
-        conn.method = conn_map.count("method") ? conn_map.at("method") : "";
-        conn.path = conn_map.count("path") ? conn_map.at("path") : "";
-        conn.status = conn_map.count("status") ? conn_map.at("status") : "unknown";
-        if (conn_map.count("start_time")) {
-            utils::safe_str_to_uint64(conn_map.at("start_time"), conn.start_time);
-        }
-        if (conn_map.count("bytes_sent")) {
-            utils::safe_str_to_uint64(conn_map.at("bytes_sent"), conn.bytes_sent);
-        }
-        if (conn_map.count("bytes_received")) {
-            utils::safe_str_to_uint64(conn_map.at("bytes_received"), conn.bytes_received);
-        }
-        result.push_back(conn);
-    }
-    
-    return result;
+    // The proxy server already tracks connections as typed ConnectionInfo
+    return proxy_server_->get_active_connections_info();
 }
 
 std::string TUI::format_uptime(uint64_t start_time) {
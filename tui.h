@@ -18,27 +18,7 @@
 // Uses ANSI escape codes for terminal control (zero dependencies)
 // Layout follows system topology
 
-struct ConnectionInfo {
-    std::string id;
-    std::string client_ip;
-    uint16_t client_port;
-    std::string target_host;
-    uint16_t target_port;
-    std::string runway_id;
-    std::string method;
-    std::string path;
-    uint64_t start_time;
-    uint64_t bytes_sent;
-    uint64_t bytes_received;
-    std::string status; // "connecting", "active", "completed", "error"
-    
-    ConnectionInfo() 
-        : client_port(0)
-        , target_port(0)
-        , start_time(0)
-        , bytes_sent(0)
-        , bytes_received(0) {}
-};
+// ConnectionInfo lives in proxy.h alongside the server that produces it
 
 class TUI {
 public:
@@ -60,6 +40,10 @@ public:
     // Update connection info (thread-safe)
     void update_connection(const ConnectionInfo& conn);
     void remove_connection(const std::string& conn_id);
+
+    // Wake the run() loop so a pending state change is drawn now rather
+    // than on the next tick (no-op on Windows, where the loop naps)
+    void wake();
     
     // Check if TUI is running
     bool is_running() const { return running_; }
@@ -109,6 +93,16 @@ private:
     std::atomic<bool> running_;
     std::atomic<bool> should_redraw_;
     std::atomic<bool> terminal_resized_;
+    // Next draw() must wipe the whole screen (first frame, after resize or
+    // the too-small warning). Steady-state frames repaint in place instead:
+    // a full \033[2J erase per frame blanks the terminal before the new
+    // frame lands, which reads as flicker
+    bool full_repaint_needed_;
+#ifndef _WIN32
+    // Self-pipe: connection updates write a byte here so the run() loop's
+    // poll() wakes and redraws immediately instead of on the next tick
+    int wake_pipe_[2];
+#endif
     std::mutex connections_mutex_;
     std::map<std::string, ConnectionInfo> connections_;
     uint64_t start_time_;
@@ -30,19 +30,32 @@
 namespace utils {
 
 bool is_valid_ipv4(const std::string& ip) {
+    // Single pass, no allocation: this runs as a type test on every hostname
+    // that flows through resolution and runway selection, so the common
+    // "not an IP" answer should cost a few character compares, not four
+    // string allocations from split()
     if (ip.empty() || ip.length() > 15) return false;
-    
-    std::vector<std::string> parts = split(ip, '.');
-    if (parts.size() != 4) return false;
-    
-    for (const auto& part : parts) {
-        if (part.empty()) return false;
-        uint32_t num;
-        if (!safe_str_to_uint32(part, num) || num > 255) {
-            return false;
+
+    int octets = 0;
+    size_t i = 0;
+    while (i < ip.length()) {
+        if (!std::isdigit(static_cast<unsigned char>(ip[i]))) return false;
+
+        uint32_t value = 0;
+        while (i < ip.length() && std::isdigit(static_cast<unsigned char>(ip[i]))) {
+            value = value * 10 + static_cast<uint32_t>(ip[i] - '0');
+            if (value > 255) return false;
+            ++i;
+        }
+        ++octets;
+
+        if (i < ip.length()) {
+            if (ip[i] != '.' || octets == 4) return false;
+            ++i;
+            if (i == ip.length()) return false; // Trailing dot
         }
     }
-    return true;
+    return octets == 4;
 }
 
 bool is_private_ip(const std::string& ip) {
@@ -103,6 +116,22 @@ std::vector<std::string> split(const std::string& str, char delimiter) {
     return result;
 }
 
+bool parse_host_port(const std::string& input, std::string& host, uint16_t& port) {
+    size_t colon = input.find(':');
+    if (colon == std::string::npos) {
+        host = input;
+        return false;
+    }
+    host = input.substr(0, colon);
+    // Port runs to the next colon if any (mirrors split()'s behavior of
+    // taking the second segment from malformed multi-colon input)
+    size_t next = input.find(':', colon + 1);
+    size_t port_len = (next == std::string::npos) ? std::string::npos
+                                                  : next - colon - 1;
+    safe_str_to_uint16(input.substr(colon + 1, port_len), port);
+    return true;
+}
+
 std::string to_lower(const std::string& str) {
     std::string result = str;
     std::transform(result.begin(), result.end(), result.begin(),
@@ -125,6 +154,43 @@ std::string format_bytes(uint64_t bytes) {
     return oss.str();
 }
 
+std::string base64_encode(const std::string& input) {
+    static const char alphabet[] =
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/";
+
+    std::string result;
+    result.reserve(((input.size() + 2) / 3) * 4);
+
+    size_t i = 0;
+    while (i + 2 < input.size()) {
+        uint32_t triple = (static_cast<uint8_t>(input[i]) << 16) |
+                          (static_cast<uint8_t>(input[i + 1]) << 8) |
+                          static_cast<uint8_t>(input[i + 2]);
+        result += alphabet[(triple >> 18) & 0x3F];
+        result += alphabet[(triple >> 12) & 0x3F];
+        result += alphabet[(triple >> 6) & 0x3F];
+        result += alphabet[triple & 0x3F];
+        i += 3;
+    }
+
+    size_t remaining = input.size() - i;
+    if (remaining == 1) {
+        uint32_t val = static_cast<uint8_t>(input[i]) << 16;
+        result += alphabet[(val >> 18) & 0x3F];
+        result += alphabet[(val >> 12) & 0x3F];
+        result += "==";
+    } else if (remaining == 2) {
+        uint32_t val = (static_cast<uint8_t>(input[i]) << 16) |
+                       (static_cast<uint8_t>(input[i + 1]) << 8);
+        result += alphabet[(val >> 18) & 0x3F];
+        result += alphabet[(val >> 12) & 0x3F];
+        result += alphabet[(val >> 6) & 0x3F];
+        result += '=';
+    }
+
+    return result;
+}
+
 bool safe_str_to_uint16(const std::string& str, uint16_t& result) {
     if (str.empty()) return false;
     char* end;
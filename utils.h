@@ -29,12 +29,23 @@ std::string trim(const std::string& str);
 // Split string by delimiter
 std::vector<std::string> split(const std::string& str, char delimiter);
 
+// Split "host[:port]" without materializing a vector of parts (split()
+// costs one vector plus a string per segment, per connection on the proxy
+// path). Writes the port only when a parsable one follows the first colon
+// and returns whether a colon was present, so callers keep their own
+// defaulting rules. IPv6 literals are not handled - the resolver and
+// dialers are IPv4-only throughout.
+bool parse_host_port(const std::string& input, std::string& host, uint16_t& port);
+
 // Convert string to lowercase
 std::string to_lower(const std::string& str);
 
 // Format bytes to human-readable size
 std::string format_bytes(uint64_t bytes);
 
+// Base64 encode (RFC 4648), used for HTTP Basic auth credentials
+std::string base64_encode(const std::string& input);
+
 // Safe string to number conversion
 bool safe_str_to_uint16(const std::string& str, uint16_t& result);
 bool safe_str_to_uint32(const std::string& str, uint32_t& result);
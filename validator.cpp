@@ -13,13 +13,20 @@ std::pair<bool, bool> SuccessValidator::validate_http(uint16_t status_code, cons
         return std::make_pair(false, false);
     }
     
-    // User success: check for actual content vs error pages
+    // User success: check for actual content vs error pages.
+    // Only the first 4 KiB is inspected: error markers sit near the top of
+    // an error page, and copying + lowercasing a multi-megabyte body to hunt
+    // for them is pure waste on every validated response
+    const size_t kScanLimit = 4096;
     bool user_success = false;
     if (!body.empty()) {
+        size_t scan_len = std::min(body.size(), kScanLimit);
+
         // Convert to string (defensive: handle non-UTF8)
         std::string content;
-        content.reserve(body.size());
-        for (uint8_t byte : body) {
+        content.reserve(scan_len);
+        for (size_t i = 0; i < scan_len; ++i) {
+            uint8_t byte = body[i];
             if (byte >= 32 && byte < 127) { // Printable ASCII
                 content += static_cast<char>(byte);
             } else if (byte == '\n' || byte == '\r' || byte == '\t') {
@@ -97,7 +97,12 @@ void WebUI::server_loop() {
             }
             continue;
         }
-        
+
+        // Dashboard responses are one small write each; without TCP_NODELAY
+        // Nagle can hold them back a delayed-ACK interval
+        tune_relay_socket(client_sock);
+
+
         // Handle connection in same thread (simple implementation)
         // For production, could use thread pool
         handle_connection(client_sock);
@@ -314,38 +319,8 @@ std::vector<std::string> WebUI::get_targets_snapshot() {
 }
 
 std::vector<ConnectionInfo> WebUI::get_connections_snapshot() {
-    // Get live connection data from proxy server
-    auto live_conns = proxy_server_->get_active_connections_info();
-    std::vector<ConnectionInfo> result;
-    
-    for (const auto& conn_map : live_conns) {
-        ConnectionInfo conn;
-        conn.id = conn_map.count("id") ? conn_map.at("id") : "";
-        conn.client_ip = conn_map.count("client_ip") ? conn_map.at("client_ip") : "";
-        if (conn_map.count("client_port")) {
-            utils::safe_str_to_uint16(conn_map.at("client_port"), conn.client_port);
-        }
-        conn.target_host = conn_map.count("target_host") ? conn_map.at("target_host") : "";
-        if (conn_map.count("target_port")) {
-            utils::safe_str_to_uint16(conn_map.at("target_port"), conn.target_port);
-        }
-        conn.runway_id = conn_map.count("runway_id") ? conn_map.at("runway_id") : "";
-        conn.method = conn_map.count("method") ? conn_map.at("method") : "";
-        conn.path = conn_map.count("path") ? conn_map.at("path") : "";
-        conn.status = conn_map.count("status") ? conn_map.at("status") : "unknown";
-        if (conn_map.count("start_time")) {
-            utils::safe_str_to_uint64(conn_map.at("start_time"), conn.start_time);
-        }
-        if (conn_map.count("bytes_sent")) {
-            utils::safe_str_to_uint64(conn_map.at("bytes_sent"), conn.bytes_sent);
-        }
-        if (conn_map.count("bytes_received")) {
-            utils::safe_str_to_uint64(conn_map.at("bytes_received"), conn.bytes_received);
-        }
-        result.push_back(conn);
-    }
-    
-    return result;
+    // The proxy server already tracks connections as typed ConnectionInfo
+    return proxy_server_->get_active_connections_info();
 }
 
 std::string WebUI::format_uptime(uint64_t start_time) {